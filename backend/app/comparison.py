@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+
+def build_comparison_samples(items_by_model: dict[str, list[dict]]) -> tuple[list[dict], dict]:
+    """Join per-model result payloads by sample_key and flag where the models disagree."""
+    verdicts: dict[str, dict[str, str | None]] = {}
+    scores: dict[str, dict[str, float | None]] = {}
+    for model_id, items in items_by_model.items():
+        for item in items:
+            verdicts.setdefault(item["sample_key"], {})[model_id] = item.get("verdict")
+            scores.setdefault(item["sample_key"], {})[model_id] = item.get("score")
+
+    rows: list[dict] = []
+    disagreements = 0
+    for sample_key, sample_verdicts in verdicts.items():
+        sample_scores = scores[sample_key]
+        # A model that produced nothing for a sample counts as disagreeing with one that did.
+        disagree = len(sample_verdicts) < len(items_by_model) or len(set(sample_verdicts.values())) > 1
+        present_scores = [score for score in sample_scores.values() if score is not None]
+        score_spread = round(max(present_scores) - min(present_scores), 4) if present_scores else None
+        disagreements += disagree
+        rows.append(
+            {
+                "sample_key": sample_key,
+                "verdicts": sample_verdicts,
+                "scores": sample_scores,
+                "disagree": disagree,
+                "score_spread": score_spread,
+            }
+        )
+
+    total = len(rows)
+    summary = {
+        "total": total,
+        "disagree": disagreements,
+        "agreement_rate": round((total - disagreements) / total, 4) if total else None,
+        "models": {
+            model_id: {
+                "total": len(items),
+                "ok": sum(1 for item in items if item.get("verdict") == "ok"),
+                "ng": sum(1 for item in items if item.get("verdict") != "ok"),
+            }
+            for model_id, items in items_by_model.items()
+        },
+    }
+    return rows, summary
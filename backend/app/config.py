@@ -3,17 +3,25 @@ from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+STORAGE_ROOT = Path("storage")
+
 
 class Settings(BaseSettings):
     app_name: str = "PoC AI Inference Tool API"
     database_url: str = "sqlite:///./poc.db"
     cors_origins: list[str] = ["http://localhost:5173"]
+    migrate_on_startup: bool = False
+    retention_archive_after_days: int = 30
+    retention_keep_latest_runs: int = 5
+    upload_session_ttl_hours: int = 24
+    maintenance_interval_seconds: int = 0
+    vacuum_freelist_ratio: float = 0.2
+    upload_chunk_size: int = 8 * 1024 * 1024
+    upload_max_chunk_size: int = 64 * 1024 * 1024
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
 
 @lru_cache
 def get_settings() -> Settings:
-    settings = Settings()
-    Path("storage").mkdir(parents=True, exist_ok=True)
-    return settings
+    return Settings()
@@ -1,19 +1,72 @@
 from __future__ import annotations
 
-from .adapters.base import BaseInferenceAdapter
-from .adapters.dummy_timeseries import DummyTimeseriesAdapter
-from .adapters.dummy_vision import DummyVisionAdapter
+from functools import lru_cache
+from importlib.metadata import EntryPoint, entry_points
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from .adapters.base import BaseInferenceAdapter
 
-def get_adapter(backend: str, modality: str) -> BaseInferenceAdapter:
-    if backend != "dummy":
+ENTRY_POINT_GROUP = "pov.inference_adapters"
+
+# Adapters are resolved by entry-point name ("{backend}_{modality}", falling back
+# to "{backend}") and only imported the first time a run asks for them, so heavy
+# ML dependencies never load during API boot.
+BUILTIN_ADAPTERS = {
+    "dummy_vision": f"{__package__}.adapters.dummy_vision:DummyVisionAdapter",
+    "dummy_timeseries": f"{__package__}.adapters.dummy_timeseries:DummyTimeseriesAdapter",
+    "dummy_mixed": f"{__package__}.adapters.dummy_vision:DummyVisionAdapter",
+    "remote_vision": f"{__package__}.adapters.remote:RemoteVisionAdapter",
+    "remote_timeseries": f"{__package__}.adapters.remote:RemoteTimeseriesAdapter",
+    "remote_mixed": f"{__package__}.adapters.remote:RemoteVisionAdapter",
+}
+
+MODALITIES = ("vision", "timeseries", "mixed")
+
+
+@lru_cache
+def _installed_entry_points() -> dict[str, EntryPoint]:
+    return {ep.name: ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+
+
+def _find_entry_point(name: str) -> EntryPoint | None:
+    target = BUILTIN_ADAPTERS.get(name)
+    if target is not None:
+        return EntryPoint(name=name, value=target, group=ENTRY_POINT_GROUP)
+    return _installed_entry_points().get(name)
+
+
+@lru_cache
+def load_adapter_class(name: str) -> type[BaseInferenceAdapter] | None:
+    entry_point = _find_entry_point(name)
+    if entry_point is None:
+        return None
+    return entry_point.load()
+
+
+def _is_known_backend(backend: str) -> bool:
+    names = set(BUILTIN_ADAPTERS) | set(_installed_entry_points())
+    return backend in names or any(f"{backend}_{modality}" in names for modality in MODALITIES)
+
+
+def resolve_adapter_class(backend: str, modality: str) -> type[BaseInferenceAdapter]:
+    if not _is_known_backend(backend):
         raise ValueError(f"Unsupported backend: {backend}")
+    if modality not in MODALITIES:
+        raise ValueError(f"Unsupported modality: {modality}")
+
+    adapter_class = load_adapter_class(f"{backend}_{modality}") or load_adapter_class(backend)
+    if adapter_class is None:
+        raise ValueError(f"Unsupported modality: {modality}")
+    return adapter_class
+
+
+def validate_adapter_config(backend: str, modality: str, config: dict | None = None) -> type[BaseInferenceAdapter]:
+    """Check a model's backend/modality/config without instantiating the adapter (no connections or threads)."""
+    adapter_class = resolve_adapter_class(backend, modality)
+    adapter_class.validate_config(config or {})
+    return adapter_class
 
-    if modality == "vision":
-        return DummyVisionAdapter()
-    if modality == "timeseries":
-        return DummyTimeseriesAdapter()
-    if modality == "mixed":
-        return DummyVisionAdapter()
 
-    raise ValueError(f"Unsupported modality: {modality}")
+def get_adapter(backend: str, modality: str, config: dict | None = None) -> BaseInferenceAdapter:
+    return resolve_adapter_class(backend, modality)(config)
@@ -1,10 +1,47 @@
 from __future__ import annotations
 
+import time
 from abc import ABC, abstractmethod
-from pathlib import Path
+from collections.abc import Iterator
+from typing import ClassVar
+
+from ..samples import Sample, SamplePlan, iter_chunks, load_samples
 
 
 class BaseInferenceAdapter(ABC):
+    # Key into samples.SAMPLE_LOADERS; adapters sharing a loader can score the
+    # same decoded samples, which is what comparison runs rely on.
+    sample_loader: ClassVar[str]
+    # How many samples run() hands to predict_batch() at once.
+    chunk_size: int = 1
+
+    def __init__(self, config: dict | None = None) -> None:
+        self.config = config or {}
+        self.validate_config(self.config)
+
+    @classmethod
+    def validate_config(cls, config: dict) -> None:
+        """Raise ValueError if a model config cannot work with this adapter; must not open resources."""
+
+    def iter_samples(self, plan: SamplePlan) -> Iterator[Sample]:
+        return load_samples(self.sample_loader, plan)
+
     @abstractmethod
-    def run(self, dataset_dir: Path, params: dict | None = None) -> list[dict]:
-        """Return list of inference result payloads with sample_key/score/verdict/detail_json/output_path."""
+    def predict(self, sample: Sample, params: dict) -> dict:
+        """Return one inference result payload with sample_key/source_file/score/verdict/detail_json/output_path."""
+
+    def predict_batch(self, samples: list[Sample], params: dict) -> list[dict]:
+        return [self.predict(sample, params) for sample in samples]
+
+    def run(self, plan: SamplePlan, params: dict | None = None) -> list[dict]:
+        params = params or {}
+        deadline = None
+        if plan.mode == "time_budget" and plan.time_budget_seconds is not None:
+            deadline = time.monotonic() + plan.time_budget_seconds
+
+        outputs: list[dict] = []
+        for chunk in iter_chunks(self.iter_samples(plan), self.chunk_size):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            outputs.extend(self.predict_batch(chunk, params))
+        return outputs
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import base64
+from urllib.parse import urlsplit
+
+from ..remote import DynamicBatcher, get_batcher
+from ..samples import Sample
+from .base import BaseInferenceAdapter
+
+DEFAULT_CONFIG = {
+    "max_batch_size": 32,
+    "max_wait_ms": 5,
+    "max_in_flight": 4,
+    "timeout_seconds": 30.0,
+    "max_retries": 3,
+    "backoff_seconds": 0.2,
+}
+
+
+class RemoteInferenceAdapter(BaseInferenceAdapter):
+    """Send samples to a model server; see ``app.inference.remote`` for the wire protocol.
+
+    Model ``config_json`` needs ``url`` and may set ``model_name`` plus any key of
+    ``DEFAULT_CONFIG``.
+    """
+
+    sample_kind = "image"
+
+    def __init__(self, config: dict | None = None) -> None:
+        super().__init__(config)
+        self.settings = self._parse_settings(self.config)
+        self._batcher: DynamicBatcher | None = None
+        # Enough samples per chunk to keep every in-flight slot busy.
+        self.chunk_size = self.settings["max_batch_size"] * self.settings["max_in_flight"]
+
+    @staticmethod
+    def _parse_settings(config: dict) -> dict:
+        settings = {**DEFAULT_CONFIG, **config}
+        return {
+            "max_batch_size": int(settings["max_batch_size"]),
+            "max_wait_seconds": float(settings["max_wait_ms"]) / 1000,
+            "max_in_flight": int(settings["max_in_flight"]),
+            "timeout": float(settings["timeout_seconds"]),
+            "max_retries": int(settings["max_retries"]),
+            "backoff_seconds": float(settings["backoff_seconds"]),
+        }
+
+    @classmethod
+    def validate_config(cls, config: dict) -> None:
+        url = config.get("url")
+        if not url:
+            raise ValueError("Remote model config requires a url")
+        parts = urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"Invalid model server url: {url}")
+        try:
+            settings = cls._parse_settings(config)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid remote model config: {exc}") from exc
+        if settings["max_batch_size"] < 1 or settings["max_in_flight"] < 1:
+            raise ValueError("max_batch_size and max_in_flight must be at least 1")
+
+    @property
+    def batcher(self) -> DynamicBatcher:
+        # Created on first use so building an adapter never starts dispatcher threads.
+        if self._batcher is None:
+            self._batcher = get_batcher(
+                self.config["url"],
+                self.config.get("model_name", "default"),
+                **self.settings,
+            )
+        return self._batcher
+
+    def _encode(self, sample: Sample) -> dict:
+        if self.sample_kind == "image":
+            data = base64.b64encode(sample.data).decode("ascii")
+        else:
+            data = sample.data
+        return {"key": sample.key, "kind": self.sample_kind, "data": data}
+
+    def _to_result(self, sample: Sample, output: dict, threshold: float) -> dict:
+        score = output.get("score")
+        verdict = output.get("verdict") or ("ok" if score is not None and score >= threshold else "ng")
+        return {
+            "sample_key": sample.key,
+            "source_file": sample.source_path.name,
+            "score": score,
+            "verdict": verdict,
+            "output_path": sample.source_path.as_posix(),
+            "detail_json": {**sample.detail, **(output.get("detail") or {}), "source_type": self.sample_kind},
+            "summary": {"rule": "remote", "model_name": self.config.get("model_name", "default"), "threshold": threshold},
+        }
+
+    def predict(self, sample: Sample, params: dict) -> dict:
+        return self.predict_batch([sample], params)[0]
+
+    def predict_batch(self, samples: list[Sample], params: dict) -> list[dict]:
+        threshold = float(params.get("threshold", 0.5))
+        # Submit everything first so the batcher can pack full batches, then wait in order.
+        futures = [self.batcher.submit(self._encode(sample)) for sample in samples]
+        return [self._to_result(sample, future.result(), threshold) for sample, future in zip(samples, futures)]
+
+
+class RemoteVisionAdapter(RemoteInferenceAdapter):
+    sample_loader = "image"
+    sample_kind = "image"
+
+
+class RemoteTimeseriesAdapter(RemoteInferenceAdapter):
+    sample_loader = "csv_rows"
+    sample_kind = "row"
@@ -0,0 +1,204 @@
+"""Transport for remote model servers: pooled keep-alive HTTP, retries and dynamic batching.
+
+Model servers speak a small JSON protocol modelled on the KServe/Triton v2 REST API::
+
+    POST {base_url}/v2/models/{model_name}/infer
+    {"inputs": [{"key": "...", "kind": "image" | "row", "data": ...}, ...]}
+    -> {"outputs": [{"score": 0.87, "verdict": "ok", "detail": {...}}, ...]}
+
+``outputs`` are positional: one per input, in the same order.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import queue
+import random
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+from urllib.parse import urlsplit
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class RemoteInferenceError(RuntimeError):
+    pass
+
+
+class HTTPConnectionPool:
+    """A LIFO pool of keep-alive connections to one host."""
+
+    def __init__(self, base_url: str, maxsize: int, timeout: float) -> None:
+        parts = urlsplit(base_url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"Invalid model server url: {base_url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue(maxsize=maxsize)
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method: str, path: str, body: bytes | None = None) -> tuple[int, bytes]:
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = self._new_connection()
+
+        try:
+            connection.request(
+                method,
+                self.base_path + path,
+                body=body,
+                headers={"Content-Type": "application/json", "Connection": "keep-alive"},
+            )
+            response = connection.getresponse()
+            payload = response.read()
+        except Exception:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            try:
+                self._idle.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+        return response.status, payload
+
+
+class ModelServerClient:
+    def __init__(
+        self,
+        pool: HTTPConnectionPool,
+        model_name: str,
+        max_retries: int,
+        backoff_seconds: float,
+    ) -> None:
+        self.pool = pool
+        self.model_name = model_name
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+    def infer(self, inputs: list[dict]) -> list[dict]:
+        body = json.dumps({"inputs": inputs}).encode("utf-8")
+        path = f"/v2/models/{self.model_name}/infer"
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                status, payload = self.pool.request("POST", path, body)
+            except (OSError, http.client.HTTPException) as exc:
+                error: Exception = exc
+            else:
+                if status == 200:
+                    outputs = json.loads(payload)["outputs"]
+                    if len(outputs) != len(inputs):
+                        raise RemoteInferenceError(f"Model server returned {len(outputs)} outputs for {len(inputs)} inputs")
+                    return outputs
+                error = RemoteInferenceError(f"Model server responded {status}: {payload[:200]!r}")
+                if status not in RETRYABLE_STATUS:
+                    raise error
+
+            if attempt < self.max_retries:
+                # Exponential backoff with full jitter.
+                time.sleep(random.uniform(0, self.backoff_seconds * 2**attempt))
+        raise RemoteInferenceError(f"Model server request failed after {self.max_retries + 1} attempts: {error}")
+
+
+class DynamicBatcher:
+    """Collect individually submitted items into batches of up to ``max_batch_size``.
+
+    A batch is sent once it is full or ``max_wait_seconds`` after its first item
+    arrived, with at most ``max_in_flight`` batches outstanding at a time.
+    """
+
+    def __init__(
+        self,
+        send_batch: Callable[[list[Any]], list[Any]],
+        max_batch_size: int,
+        max_wait_seconds: float,
+        max_in_flight: int,
+    ) -> None:
+        self._send_batch = send_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._queue: queue.Queue[tuple[Any, Future]] = queue.Queue()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="remote-batch")
+        threading.Thread(target=self._dispatch, name="remote-batcher", daemon=True).start()
+
+    def submit(self, item: Any) -> Future:
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _dispatch(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait_seconds
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._slots.acquire()
+            self._executor.submit(self._send, batch)
+
+    def _send(self, batch: list[tuple[Any, Future]]) -> None:
+        try:
+            outputs = self._send_batch([item for item, _future in batch])
+            for (_item, future), output in zip(batch, outputs):
+                future.set_result(output)
+        except Exception as exc:  # noqa: BLE001
+            for _item, future in batch:
+                future.set_exception(exc)
+        finally:
+            self._slots.release()
+
+
+_pools: dict[tuple, HTTPConnectionPool] = {}
+_batchers: dict[tuple, DynamicBatcher] = {}
+_registry_lock = threading.Lock()
+
+
+def get_batcher(
+    base_url: str,
+    model_name: str,
+    *,
+    max_batch_size: int,
+    max_wait_seconds: float,
+    max_in_flight: int,
+    timeout: float,
+    max_retries: int,
+    backoff_seconds: float,
+) -> DynamicBatcher:
+    """Return the process-wide batcher for a model, so concurrent runs share batches and connections."""
+    pool_key = (base_url, timeout)
+    batcher_key = (base_url, model_name, max_batch_size, max_wait_seconds, max_in_flight, timeout, max_retries, backoff_seconds)
+    with _registry_lock:
+        batcher = _batchers.get(batcher_key)
+        if batcher is None:
+            pool = _pools.get(pool_key)
+            if pool is None:
+                pool = _pools[pool_key] = HTTPConnectionPool(base_url, maxsize=max_in_flight, timeout=timeout)
+            client = ModelServerClient(pool, model_name, max_retries=max_retries, backoff_seconds=backoff_seconds)
+            batcher = _batchers[batcher_key] = DynamicBatcher(
+                client.infer,
+                max_batch_size=max_batch_size,
+                max_wait_seconds=max_wait_seconds,
+                max_in_flight=max_in_flight,
+            )
+        return batcher
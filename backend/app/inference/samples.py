@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import csv
+import imghdr
+import random
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp"}
+
+# Which manifest modality each loader reads.
+LOADER_MODALITIES = {"image": "image", "csv_rows": "csv"}
+
+
+@dataclass
+class Sample:
+    key: str
+    source_path: Path
+    data: Any
+    detail: dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    file_name: str
+    path: Path
+    modality: str  # image | csv | other
+    size_bytes: int
+    sha256: str | None
+    row_count: int | None
+
+
+@dataclass
+class SamplePlan:
+    """Which samples of a dataset a run should score.
+
+    Loaders walk ``manifest`` (built from DatasetFile rows) instead of listing the
+    dataset directory. ``sample_range`` restricts a run to ``[start, stop)`` of the
+    loader's sample ordinals so parallel workers can split one dataset.
+    ``random_sample`` draws ``sample_size`` samples stratified by source file
+    (proportional allocation); ``first_n`` takes the first ``sample_size`` in
+    dataset order; ``time_budget`` streams in dataset order and the runner stops
+    after ``time_budget_seconds``. ``exclude_keys`` skips samples that were
+    already scored, e.g. by the preview a full run was promoted from.
+    """
+
+    manifest: list[ManifestEntry]
+    mode: str = "full"
+    sample_size: int | None = None
+    time_budget_seconds: float | None = None
+    seed: int | None = None
+    sample_range: tuple[int, int] | None = None
+    exclude_keys: frozenset[str] = frozenset()
+
+    def entries(self, loader: str) -> list[ManifestEntry]:
+        return [entry for entry in self.manifest if entry.modality == LOADER_MODALITIES[loader]]
+
+    def limit(self, samples: Iterator[Sample]) -> Iterator[Sample]:
+        if self.mode == "first_n" and self.sample_size is not None:
+            return islice(samples, self.sample_size)
+        return samples
+
+
+def iter_chunks(samples: Iterable[Sample], size: int) -> Iterator[list[Sample]]:
+    iterator = iter(samples)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def allocate_stratified(counts: dict[str, int], sample_size: int, rng: random.Random) -> dict[str, set[int]]:
+    """Pick ``sample_size`` indices across strata, proportionally to stratum size (largest remainder)."""
+    population = sum(counts.values())
+    if sample_size >= population:
+        return {stratum: set(range(count)) for stratum, count in counts.items()}
+
+    quotas = {stratum: sample_size * count / population for stratum, count in counts.items()}
+    allocation = {stratum: int(quota) for stratum, quota in quotas.items()}
+    remaining = sample_size - sum(allocation.values())
+    for stratum in sorted(quotas, key=lambda key: quotas[key] - allocation[key], reverse=True)[:remaining]:
+        allocation[stratum] += 1
+
+    return {stratum: set(rng.sample(range(counts[stratum]), allocation[stratum])) for stratum in counts}
+
+
+def _load_image(entry: ManifestEntry) -> Sample:
+    data = entry.path.read_bytes()
+    return Sample(
+        key=entry.file_name,
+        source_path=entry.path,
+        data=data,
+        detail={"image_type": imghdr.what(None, h=data[:32])},
+    )
+
+
+def iter_image_samples(plan: SamplePlan) -> Iterator[Sample]:
+    entries = plan.entries("image")
+    if plan.sample_range is not None:
+        entries = entries[slice(*plan.sample_range)]
+    entries = [entry for entry in entries if entry.file_name not in plan.exclude_keys]
+    if plan.mode == "random_sample" and plan.sample_size is not None:
+        # Every image is its own source file, so stratification reduces to a simple random sample.
+        chosen = allocate_stratified({"images": len(entries)}, plan.sample_size, random.Random(plan.seed))
+        entries = [entry for index, entry in enumerate(entries) if index in chosen["images"]]
+
+    return plan.limit(_load_image(entry) for entry in entries)
+
+
+def _iter_csv_rows(file_path: Path) -> Iterator[tuple[int, list[str]]]:
+    with file_path.open("r", encoding="utf-8", newline="") as f:
+        yield from enumerate(csv.reader(f))
+
+
+def count_csv_rows(file_path: Path) -> int:
+    return sum(1 for _ in _iter_csv_rows(file_path))
+
+
+def _csv_windows(plan: SamplePlan) -> list[tuple[ManifestEntry, int, int]]:
+    """Map the plan's ordinal range onto ``(entry, first_row, stop_row)`` per CSV file."""
+    start, stop = plan.sample_range or (0, None)
+    windows: list[tuple[ManifestEntry, int, int]] = []
+    offset = 0
+    for entry in plan.entries("csv_rows"):
+        if stop is not None and offset >= stop:
+            break
+        row_count = entry.row_count if entry.row_count is not None else count_csv_rows(entry.path)
+        first = max(start - offset, 0)
+        last = row_count if stop is None else min(stop - offset, row_count)
+        if first < last:
+            windows.append((entry, first, last))
+        offset += row_count
+    return windows
+
+
+def iter_csv_row_samples(plan: SamplePlan) -> Iterator[Sample]:
+    windows = _csv_windows(plan)
+
+    excluded: dict[str, set[int]] = {}
+    for key in plan.exclude_keys:
+        file_name, separator, row_index = key.rpartition(":row:")
+        if separator and row_index.isdigit():
+            excluded.setdefault(file_name, set()).add(int(row_index))
+
+    chosen: dict[str, set[int]] | None = None
+    if plan.mode == "random_sample" and plan.sample_size is not None:
+        # Row counts come from the manifest, so picking the sample needs no extra pass;
+        # positions index each file's eligible (in-window, not excluded) rows.
+        counts = {
+            entry.file_name: (last - first)
+            - sum(1 for row_index in excluded.get(entry.file_name, ()) if first <= row_index < last)
+            for entry, first, last in windows
+        }
+        chosen = allocate_stratified(counts, plan.sample_size, random.Random(plan.seed))
+
+    def generate() -> Iterator[Sample]:
+        for entry, first, last in windows:
+            picks = chosen[entry.file_name] if chosen is not None else None
+            if picks is not None and not picks:
+                continue
+            skipped = excluded.get(entry.file_name, set())
+            position = 0
+            for row_index, row in _iter_csv_rows(entry.path):
+                if row_index >= last:
+                    break
+                if row_index < first or row_index in skipped:
+                    continue
+                if picks is None or position in picks:
+                    yield Sample(
+                        key=f"{entry.file_name}:row:{row_index}",
+                        source_path=entry.path,
+                        data=row,
+                        detail={"row_index": row_index},
+                    )
+                position += 1
+
+    return plan.limit(generate())
+
+
+def count_samples(plan: SamplePlan, loader: str) -> int:
+    """Number of samples in the plan's range before sampling or exclusions."""
+    if loader == "image":
+        entries = plan.entries("image")
+        return len(entries[slice(*plan.sample_range)] if plan.sample_range is not None else entries)
+    return sum(last - first for _entry, first, last in _csv_windows(plan))
+
+
+SAMPLE_LOADERS = {
+    "image": iter_image_samples,
+    "csv_rows": iter_csv_row_samples,
+}
+
+
+def load_samples(loader: str, plan: SamplePlan) -> Iterator[Sample]:
+    if loader not in SAMPLE_LOADERS:
+        raise ValueError(f"Unsupported sample loader: {loader}")
+    return SAMPLE_LOADERS[loader](plan)
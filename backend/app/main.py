@@ -3,37 +3,89 @@ from __future__ import annotations
 import csv
 import imghdr
 import json
+import math
+import os
+import random
 import shutil
+from collections.abc import Iterable
 from datetime import datetime, timezone
 from pathlib import Path
 
-from fastapi import BackgroundTasks, Depends, FastAPI, File, HTTPException, Query, UploadFile
+from fastapi import BackgroundTasks, Depends, FastAPI, File, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from . import models  # noqa: F401
-from .config import get_settings
-from .database import Base, SessionLocal, engine, get_db
-from .inference.adapter_registry import get_adapter
-from .models import Dataset, DatasetFile, InferenceResult, InferenceRun, Model, Project, Validation
+from .config import STORAGE_ROOT, get_settings
+from .database import SessionLocal, get_db
+from .comparison import build_comparison_samples
+from .inference.adapter_registry import get_adapter, validate_adapter_config
+from .inference.samples import LOADER_MODALITIES, SamplePlan, count_samples, iter_chunks
+from .manifest import build_manifest, classify_modality, file_sha256, sharded_path, split_ranges
+from .models import (
+    ComparisonRun,
+    ComparisonSample,
+    Dataset,
+    DatasetFile,
+    InferenceResult,
+    InferenceRun,
+    Model,
+    Project,
+    RetentionPolicy,
+    UploadChunk,
+    UploadSession,
+    UploadSessionFile,
+    Validation,
+)
+from .preview import estimate_population, estimate_summary
+from .result_search import (
+    filter_sample_key_contains,
+    filter_sample_key_prefix,
+    filter_validated,
+)
+from .retention import (
+    ArchiveUnavailableError,
+    build_storage_report,
+    get_effective_policy,
+    rehydrate_run,
+    run_maintenance_cycle,
+    start_maintenance_scheduler,
+)
 from .schemas import (
+    ComparisonRunCreate,
+    ComparisonRunRead,
+    ComparisonSampleRead,
+    ComparisonSortField,
     DatasetCreate,
     DatasetFileRead,
+    DatasetManifestRead,
     DatasetRead,
     InferenceResultRead,
     InferenceRunCreate,
     InferenceRunRead,
+    ManifestEntryRead,
+    ModelCreate,
     ModelRead,
     ProjectCreate,
     ProjectRead,
+    ResultSortField,
+    RetentionPolicyRead,
+    RetentionPolicyUpdate,
+    SortOrder,
+    StorageReport,
+    UploadChunkAck,
+    UploadSessionCreate,
+    UploadSessionFileRead,
+    UploadSessionRead,
     ValidationCreate,
     ValidationRead,
 )
-from .seed import seed_models
 
 settings = get_settings()
-STORAGE_ROOT = Path("storage")
 
 app = FastAPI(title=settings.app_name)
 
@@ -44,18 +96,28 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.mount("/static", StaticFiles(directory=str(STORAGE_ROOT)), name="static")
+# The storage directory is created on startup, not at import time.
+app.mount("/static", StaticFiles(directory=str(STORAGE_ROOT), check_dir=False), name="static")
 
 
 @app.on_event("startup")
 def on_startup() -> None:
-    Base.metadata.create_all(bind=engine)
+    STORAGE_ROOT.mkdir(parents=True, exist_ok=True)
+    # Schema migration and seeding normally run once per deploy via
+    # `python -m app.migrate`; replicas only migrate on boot when asked to.
+    if settings.migrate_on_startup:
+        from .migrate import main as migrate
 
-    db = SessionLocal()
-    try:
-        seed_models(db)
-    finally:
-        db.close()
+        migrate()
+    if settings.maintenance_interval_seconds > 0:
+        app.state.maintenance_stop = start_maintenance_scheduler(settings.maintenance_interval_seconds)
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    maintenance_stop = getattr(app.state, "maintenance_stop", None)
+    if maintenance_stop is not None:
+        maintenance_stop.set()
 
 
 @app.get("/health")
@@ -95,6 +157,44 @@ def create_dataset(project_id: str, payload: DatasetCreate, db: Session = Depend
     return dataset
 
 
+@app.get("/api/projects/{project_id}/retention-policy", response_model=RetentionPolicyRead)
+def get_retention_policy(project_id: str, db: Session = Depends(get_db)) -> RetentionPolicyRead:
+    if db.get(Project, project_id) is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return get_effective_policy(db, project_id)
+
+
+@app.put("/api/projects/{project_id}/retention-policy", response_model=RetentionPolicyRead)
+def update_retention_policy(
+    project_id: str,
+    payload: RetentionPolicyUpdate,
+    db: Session = Depends(get_db),
+) -> RetentionPolicyRead:
+    if db.get(Project, project_id) is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    policy = db.query(RetentionPolicy).filter(RetentionPolicy.project_id == project_id).one_or_none()
+    if policy is None:
+        policy = RetentionPolicy(project_id=project_id)
+        db.add(policy)
+    policy.enabled = payload.enabled
+    policy.archive_after_days = payload.archive_after_days
+    policy.keep_latest_runs = payload.keep_latest_runs
+    db.commit()
+    return get_effective_policy(db, project_id)
+
+
+@app.get("/api/storage/report", response_model=StorageReport)
+def get_storage_report(db: Session = Depends(get_db)) -> StorageReport:
+    return build_storage_report(db)
+
+
+@app.post("/api/storage/compact", status_code=202)
+def compact_storage(background_tasks: BackgroundTasks, force_vacuum: bool = False) -> dict[str, str]:
+    background_tasks.add_task(run_maintenance_cycle, force_vacuum)
+    return {"status": "scheduled"}
+
+
 @app.get("/api/models", response_model=list[ModelRead])
 def list_models(modality: str | None = None, db: Session = Depends(get_db)) -> list[Model]:
     query = db.query(Model)
@@ -107,6 +207,32 @@ def list_models(modality: str | None = None, db: Session = Depends(get_db)) -> l
     return query.order_by(Model.created_at.asc()).all()
 
 
+@app.post("/api/models", response_model=ModelRead)
+def create_model(payload: ModelCreate, db: Session = Depends(get_db)) -> Model:
+    if payload.task_type not in {"vision", "timeseries", "mixed"}:
+        raise HTTPException(status_code=400, detail="Invalid modality")
+    try:
+        validate_adapter_config(payload.backend, payload.task_type, payload.config)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    model = Model(
+        name=payload.name,
+        task_type=payload.task_type,
+        backend=payload.backend,
+        version=payload.version,
+        config_json=payload.config,
+    )
+    db.add(model)
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Model name already exists") from exc
+    db.refresh(model)
+    return model
+
+
 def extract_metadata(file_path: Path) -> dict:
     metadata: dict[str, int | str] = {}
     image_type = imghdr.what(file_path)
@@ -114,15 +240,77 @@ def extract_metadata(file_path: Path) -> dict:
         metadata["image_type"] = image_type
 
     if file_path.suffix.lower() == ".csv":
+        row_count = 0
+        col_count = 0
         with file_path.open("r", encoding="utf-8", newline="") as f:
-            reader = csv.reader(f)
-            rows = list(reader)
-        metadata["row"] = len(rows)
-        metadata["col"] = max((len(row) for row in rows), default=0)
+            for row in csv.reader(f):
+                row_count += 1
+                col_count = max(col_count, len(row))
+        metadata["row"] = row_count
+        metadata["col"] = col_count
 
     return metadata
 
 
+def index_dataset_file(file_path: Path) -> dict:
+    """Manifest columns for a stored upload, computed once so runs never re-read the directory."""
+    metadata = extract_metadata(file_path)
+    modality = classify_modality(file_path.name)
+    return {
+        "modality": modality,
+        "sha256": file_sha256(file_path),
+        "row_count": metadata.get("row") if modality == "csv" else None,
+        "size_bytes": file_path.stat().st_size,
+        "meta_json": metadata or None,
+    }
+
+
+def dataset_raw_dir(dataset: Dataset) -> Path:
+    return STORAGE_ROOT / dataset.project_id / "datasets" / dataset.id / "raw"
+
+
+def _index_dataset_files_background(dataset_file_ids: list[str]) -> None:
+    # Hashing and CSV parsing read whole files, which for multi-GB chunked
+    # uploads takes minutes, so finalize leaves it to this task. Until it
+    # finishes, sha256/row_count are null and runs count CSV rows themselves.
+    db = SessionLocal()
+    try:
+        for dataset_file in db.query(DatasetFile).filter(DatasetFile.id.in_(dataset_file_ids)).all():
+            try:
+                columns = index_dataset_file(Path(dataset_file.file_path))
+            except (OSError, UnicodeDecodeError, csv.Error) as exc:
+                columns = {"meta_json": {"index_error": str(exc)}}
+            for key, value in columns.items():
+                setattr(dataset_file, key, value)
+            db.commit()
+    finally:
+        db.close()
+
+
+def _drop_superseded_files(db: Session, dataset_id: str, file_names: Iterable[str]) -> None:
+    # Re-uploading a name overwrites the stored file, so older rows would point at new bytes.
+    db.execute(
+        delete(DatasetFile).where(DatasetFile.dataset_id == dataset_id, DatasetFile.file_name.in_(set(file_names)))
+    )
+
+
+def to_dataset_file_read(dataset_file: DatasetFile) -> DatasetFileRead:
+    return DatasetFileRead(
+        id=dataset_file.id,
+        dataset_id=dataset_file.dataset_id,
+        file_name=dataset_file.file_name,
+        file_path=dataset_file.file_path,
+        media_type=dataset_file.media_type,
+        modality=dataset_file.modality,
+        sha256=dataset_file.sha256,
+        row_count=dataset_file.row_count,
+        size_bytes=dataset_file.size_bytes,
+        meta_json=dataset_file.meta_json,
+        created_at=dataset_file.created_at,
+        static_url=f"/static/{Path(dataset_file.file_path).relative_to(STORAGE_ROOT).as_posix()}",
+    )
+
+
 @app.post("/api/datasets/{dataset_id}/files", response_model=list[DatasetFileRead])
 def upload_dataset_files(
     dataset_id: str,
@@ -133,17 +321,19 @@ def upload_dataset_files(
     if dataset is None:
         raise HTTPException(status_code=404, detail="Dataset not found")
 
-    raw_dir = STORAGE_ROOT / dataset.project_id / "datasets" / dataset.id / "raw"
+    raw_dir = dataset_raw_dir(dataset)
     raw_dir.mkdir(parents=True, exist_ok=True)
 
     if not files:
         raise HTTPException(status_code=400, detail="No files provided")
 
     created_files: list[DatasetFileRead] = []
+    _drop_superseded_files(db, dataset.id, (Path(upload.filename or "upload.bin").name for upload in files))
 
     for upload in files:
         safe_name = Path(upload.filename or "upload.bin").name
-        destination = raw_dir / safe_name
+        destination = sharded_path(raw_dir, safe_name)
+        destination.parent.mkdir(exist_ok=True)
         with destination.open("wb") as out:
             shutil.copyfileobj(upload.file, out)
 
@@ -153,31 +343,381 @@ def upload_dataset_files(
             file_name=safe_name,
             file_path=rel_path,
             media_type=upload.content_type,
-            size_bytes=destination.stat().st_size,
-            meta_json=extract_metadata(destination) or None,
+            **index_dataset_file(destination),
         )
         db.add(dataset_file)
         db.flush()
         db.refresh(dataset_file)
 
-        created_files.append(
-            DatasetFileRead(
-                id=dataset_file.id,
-                dataset_id=dataset_file.dataset_id,
-                file_name=dataset_file.file_name,
-                file_path=dataset_file.file_path,
-                media_type=dataset_file.media_type,
-                size_bytes=dataset_file.size_bytes,
-                meta_json=dataset_file.meta_json,
-                created_at=dataset_file.created_at,
-                static_url=f"/static/{Path(dataset_file.file_path).relative_to(STORAGE_ROOT).as_posix()}",
+        created_files.append(to_dataset_file_read(dataset_file))
+
+    db.commit()
+    return created_files
+
+
+@app.get("/api/datasets/{dataset_id}/manifest", response_model=DatasetManifestRead)
+def get_dataset_manifest(
+    dataset_id: str,
+    parts: int = Query(default=1, ge=1, le=256),
+    db: Session = Depends(get_db),
+) -> DatasetManifestRead:
+    if db.get(Dataset, dataset_id) is None:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    plan = SamplePlan(manifest=build_manifest(db, dataset_id))
+    sample_counts = {loader: count_samples(plan, loader) for loader in LOADER_MODALITIES}
+    return DatasetManifestRead(
+        dataset_id=dataset_id,
+        files=[
+            ManifestEntryRead(
+                file_name=entry.file_name,
+                file_path=entry.path.as_posix(),
+                modality=entry.modality,
+                size_bytes=entry.size_bytes,
+                sha256=entry.sha256,
+                row_count=entry.row_count,
+            )
+            for entry in plan.manifest
+        ],
+        total_bytes=sum(entry.size_bytes for entry in plan.manifest),
+        sample_counts=sample_counts,
+        splits={loader: split_ranges(count, parts) for loader, count in sample_counts.items()},
+    )
+
+
+def _received_chunks(db: Session, upload_session: UploadSession) -> dict[str, set[int]]:
+    rows = db.execute(
+        select(UploadChunk.session_file_id, UploadChunk.chunk_index)
+        .join(UploadSessionFile, UploadSessionFile.id == UploadChunk.session_file_id)
+        .where(UploadSessionFile.session_id == upload_session.id)
+    ).all()
+
+    received: dict[str, set[int]] = {}
+    for session_file_id, chunk_index in rows:
+        received.setdefault(session_file_id, set()).add(chunk_index)
+    return received
+
+
+def _to_upload_session_read(db: Session, upload_session: UploadSession) -> UploadSessionRead:
+    received = _received_chunks(db, upload_session)
+    return UploadSessionRead(
+        id=upload_session.id,
+        dataset_id=upload_session.dataset_id,
+        chunk_size=upload_session.chunk_size,
+        status=upload_session.status,
+        files=[
+            UploadSessionFileRead(
+                file_index=session_file.file_index,
+                file_name=session_file.file_name,
+                media_type=session_file.media_type,
+                size_bytes=session_file.size_bytes,
+                total_chunks=session_file.total_chunks,
+                received_chunks=sorted(received.get(session_file.id, set())),
+            )
+            for session_file in upload_session.files
+        ],
+        created_at=upload_session.created_at,
+        finalized_at=upload_session.finalized_at,
+    )
+
+
+def _get_open_upload_session(db: Session, session_id: str) -> UploadSession:
+    upload_session = db.get(UploadSession, session_id)
+    if upload_session is None:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    if upload_session.status != "open":
+        raise HTTPException(status_code=409, detail="Upload session is already finalized")
+    return upload_session
+
+
+@app.post("/api/datasets/{dataset_id}/uploads", response_model=UploadSessionRead)
+def create_upload_session(
+    dataset_id: str,
+    payload: UploadSessionCreate,
+    db: Session = Depends(get_db),
+) -> UploadSessionRead:
+    dataset = db.get(Dataset, dataset_id)
+    if dataset is None:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    chunk_size = payload.chunk_size or settings.upload_chunk_size
+    if chunk_size > settings.upload_max_chunk_size:
+        raise HTTPException(status_code=400, detail="Chunk size is too large")
+
+    # Files are stored by name, so two files with one name would overwrite each other on finalize.
+    file_names = [Path(spec.file_name or "upload.bin").name for spec in payload.files]
+    duplicates = sorted({name for name in file_names if file_names.count(name) > 1})
+    if duplicates:
+        raise HTTPException(status_code=400, detail=f"Duplicate file names in upload: {', '.join(duplicates)}")
+
+    raw_dir = dataset_raw_dir(dataset)
+    raw_dir.mkdir(parents=True, exist_ok=True)
+
+    upload_session = UploadSession(dataset_id=dataset.id, chunk_size=chunk_size, status="open")
+    db.add(upload_session)
+    db.flush()
+
+    for file_index, (spec, file_name) in enumerate(zip(payload.files, file_names)):
+        # Chunks land at their final offset in a hidden part file next to the
+        # destination, so finalize is a rename instead of a concatenation.
+        db.add(
+            UploadSessionFile(
+                session_id=upload_session.id,
+                file_index=file_index,
+                file_name=file_name,
+                media_type=spec.media_type,
+                size_bytes=spec.size_bytes,
+                total_chunks=math.ceil(spec.size_bytes / chunk_size),
+                part_path=(raw_dir / f".upload-{upload_session.id}-{file_index}.part").as_posix(),
             )
         )
 
     db.commit()
+    db.refresh(upload_session)
+    return _to_upload_session_read(db, upload_session)
+
+
+@app.get("/api/uploads/{session_id}", response_model=UploadSessionRead)
+def get_upload_session(session_id: str, db: Session = Depends(get_db)) -> UploadSessionRead:
+    upload_session = db.get(UploadSession, session_id)
+    if upload_session is None:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return _to_upload_session_read(db, upload_session)
+
+
+def _prepare_chunk(db: Session, session_id: str, file_index: int, chunk_index: int) -> tuple[str, int, int, bool]:
+    upload_session = _get_open_upload_session(db, session_id)
+    session_file = (
+        db.query(UploadSessionFile)
+        .filter(UploadSessionFile.session_id == upload_session.id, UploadSessionFile.file_index == file_index)
+        .one_or_none()
+    )
+    if session_file is None:
+        raise HTTPException(status_code=404, detail="Upload file not found")
+    if not 0 <= chunk_index < session_file.total_chunks:
+        raise HTTPException(status_code=400, detail="Chunk index out of range")
+
+    offset = chunk_index * upload_session.chunk_size
+    expected = min(upload_session.chunk_size, session_file.size_bytes - offset)
+    already_received = (
+        db.query(UploadChunk.id)
+        .filter(UploadChunk.session_file_id == session_file.id, UploadChunk.chunk_index == chunk_index)
+        .first()
+    )
+    return session_file.part_path, offset, expected, already_received is not None
+
+
+def _record_chunk(db: Session, session_id: str, file_index: int, chunk_index: int) -> None:
+    session_file_id = db.scalar(
+        select(UploadSessionFile.id).where(
+            UploadSessionFile.session_id == session_id, UploadSessionFile.file_index == file_index
+        )
+    )
+    db.add(UploadChunk(session_file_id=session_file_id, chunk_index=chunk_index))
+    db.execute(update(UploadSession).where(UploadSession.id == session_id).values(updated_at=datetime.now(timezone.utc)))
+    try:
+        db.commit()
+    except IntegrityError:
+        # A parallel retry of the same chunk won the race; the bytes are identical.
+        db.rollback()
+
+
+@app.put("/api/uploads/{session_id}/files/{file_index}/chunks/{chunk_index}", response_model=UploadChunkAck)
+async def upload_chunk(
+    session_id: str,
+    file_index: int,
+    chunk_index: int,
+    request: Request,
+    db: Session = Depends(get_db),
+) -> UploadChunkAck:
+    # Database calls are blocking, so they run in the threadpool like the writes;
+    # only the body streaming happens on the event loop.
+    part_path, offset, expected, already_received = await run_in_threadpool(
+        _prepare_chunk, db, session_id, file_index, chunk_index
+    )
+
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) != expected:
+        raise HTTPException(status_code=400, detail=f"Chunk size mismatch: expected {expected}, got {content_length}")
+
+    if already_received:
+        # Acknowledged chunks are never rewritten, so a retried PUT cannot corrupt them.
+        return UploadChunkAck(session_id=session_id, file_index=file_index, chunk_index=chunk_index, size_bytes=expected)
+
+    # The raw request body is streamed straight into the part file; nothing is
+    # spooled by python-multipart.
+    written = 0
+    fd = os.open(part_path, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        async for piece in request.stream():
+            if not piece:
+                continue
+            if written + len(piece) > expected:
+                raise HTTPException(status_code=400, detail="Chunk is larger than expected")
+            await run_in_threadpool(os.pwrite, fd, piece, offset + written)
+            written += len(piece)
+    finally:
+        os.close(fd)
+
+    if written != expected:
+        raise HTTPException(status_code=400, detail=f"Chunk size mismatch: expected {expected}, got {written}")
+
+    await run_in_threadpool(_record_chunk, db, session_id, file_index, chunk_index)
+    return UploadChunkAck(session_id=session_id, file_index=file_index, chunk_index=chunk_index, size_bytes=written)
+
+
+def _set_upload_status(db: Session, upload_session: UploadSession, status: str, expected: str) -> bool:
+    updated = db.execute(
+        update(UploadSession)
+        .where(UploadSession.id == upload_session.id, UploadSession.status == expected)
+        .values(status=status, updated_at=datetime.now(timezone.utc))
+    ).rowcount
+    db.commit()
+    return bool(updated)
+
+
+@app.post("/api/uploads/{session_id}/finalize", response_model=list[DatasetFileRead])
+def finalize_upload_session(
+    session_id: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+) -> list[DatasetFileRead]:
+    upload_session = _get_open_upload_session(db, session_id)
+    dataset = db.get(Dataset, upload_session.dataset_id)
+    if dataset is None:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    received = _received_chunks(db, upload_session)
+    missing = {
+        session_file.file_index: missing_chunks
+        for session_file in upload_session.files
+        if (
+            missing_chunks := [
+                index for index in range(session_file.total_chunks) if index not in received.get(session_file.id, set())
+            ]
+        )
+    }
+    if missing:
+        raise HTTPException(status_code=409, detail={"message": "Upload is incomplete", "missing_chunks": missing})
+
+    # Claim the session before touching any file, so concurrent or retried
+    # finalize calls can never rename a part file twice.
+    if not _set_upload_status(db, upload_session, "finalizing", expected="open"):
+        raise HTTPException(status_code=409, detail="Upload session is already finalized")
+
+    lost = {
+        session_file.id: session_file
+        for session_file in upload_session.files
+        if session_file.total_chunks and not Path(session_file.part_path).exists()
+    }
+    if lost:
+        # The acknowledged bytes are gone; forget their chunks so the client re-sends them.
+        db.query(UploadChunk).filter(UploadChunk.session_file_id.in_(lost)).delete()
+        _set_upload_status(db, upload_session, "open", expected="finalizing")
+        missing = {session_file.file_index: list(range(session_file.total_chunks)) for session_file in lost.values()}
+        raise HTTPException(status_code=409, detail={"message": "Part files are missing", "missing_chunks": missing})
+
+    raw_dir = dataset_raw_dir(dataset)
+    moved: list[tuple[Path, Path]] = []
+    try:
+        rows: list[dict] = []
+        for session_file in upload_session.files:
+            part_path = Path(session_file.part_path)
+            part_path.touch()
+            os.truncate(part_path, session_file.size_bytes)
+            rows.append(
+                {
+                    "dataset_id": dataset.id,
+                    "file_name": session_file.file_name,
+                    "file_path": sharded_path(raw_dir, session_file.file_name).as_posix(),
+                    "media_type": session_file.media_type,
+                    "modality": classify_modality(session_file.file_name),
+                    "size_bytes": session_file.size_bytes,
+                }
+            )
+
+        for session_file, row in zip(upload_session.files, rows):
+            destination = Path(row["file_path"])
+            destination.parent.mkdir(exist_ok=True)
+            Path(session_file.part_path).replace(destination)
+            moved.append((destination, Path(session_file.part_path)))
+
+        _drop_superseded_files(db, dataset.id, (row["file_name"] for row in rows))
+        dataset_files = db.scalars(insert(DatasetFile).returning(DatasetFile), rows).all()
+        created_files = [to_dataset_file_read(dataset_file) for dataset_file in dataset_files]
+
+        upload_session.status = "finalized"
+        upload_session.finalized_at = datetime.now(timezone.utc)
+        db.commit()
+    except Exception:
+        # Put the part files back and reopen the session so finalize can be retried.
+        db.rollback()
+        for destination, part_path in reversed(moved):
+            destination.replace(part_path)
+        _set_upload_status(db, upload_session, "open", expected="finalizing")
+        raise
+
+    background_tasks.add_task(_index_dataset_files_background, [dataset_file.id for dataset_file in created_files])
     return created_files
 
 
+def _store_run_results(db: Session, run: InferenceRun, items: list[dict]) -> None:
+    output_dir = STORAGE_ROOT / run.project_id / "runs" / run.id / "outputs"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    db.query(InferenceResult).filter(InferenceResult.run_id == run.id).delete()
+    for item in items:
+        output_path = item.get("output_path")
+        if output_path:
+            output_ref = Path(output_path)
+            if output_ref.exists():
+                manifest_path = output_dir / f"{item['sample_key'].replace('/', '_')}.json"
+                manifest_path.write_text(json.dumps(item, ensure_ascii=False), encoding="utf-8")
+
+        db.add(
+            InferenceResult(
+                run_id=run.id,
+                sample_key=item["sample_key"],
+                source_file=item.get("source_file"),
+                score=item.get("score"),
+                verdict=item.get("verdict"),
+                output_path=item.get("output_path"),
+                detail_json=item.get("detail_json"),
+                summary=item.get("summary"),
+            )
+        )
+
+    total = len(items)
+    ok_count = sum(1 for item in items if item.get("verdict") == "ok")
+    run.summary_json = {
+        "total": total,
+        "ok": ok_count,
+        "ng": total - ok_count,
+        "output_dir": output_dir.as_posix(),
+    }
+    run.status = "done"
+    run.finished_at = datetime.now(timezone.utc)
+
+
+def _sample_plan(
+    db: Session,
+    run: InferenceRun,
+    dataset: Dataset,
+    exclude_keys: frozenset[str] = frozenset(),
+) -> SamplePlan:
+    plan_json = run.plan_json or {}
+    sample_range = plan_json.get("range")
+    return SamplePlan(
+        manifest=build_manifest(db, dataset.id),
+        mode=plan_json.get("mode", "full"),
+        sample_size=plan_json.get("sample_size"),
+        time_budget_seconds=plan_json.get("time_budget_seconds"),
+        seed=plan_json.get("seed"),
+        sample_range=tuple(sample_range) if sample_range else None,
+        exclude_keys=exclude_keys,
+    )
+
+
 def _run_inference_background(run_id: str) -> None:
     db = SessionLocal()
     try:
@@ -195,44 +735,42 @@ def _run_inference_background(run_id: str) -> None:
         if dataset is None or model is None:
             raise ValueError("Dataset or model not found")
 
-        dataset_dir = STORAGE_ROOT / dataset.project_id / "datasets" / dataset.id / "raw"
-        adapter = get_adapter(model.backend, model.task_type)
-        items = adapter.run(dataset_dir, run.params_json or {})
-
-        output_dir = STORAGE_ROOT / run.project_id / "runs" / run.id / "outputs"
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        db.query(InferenceResult).filter(InferenceResult.run_id == run.id).delete()
-        for item in items:
-            output_path = item.get("output_path")
-            if output_path:
-                output_ref = Path(output_path)
-                if output_ref.exists():
-                    manifest_path = output_dir / f"{item['sample_key'].replace('/', '_')}.json"
-                    manifest_path.write_text(json.dumps(item, ensure_ascii=False), encoding="utf-8")
-
-            db.add(
-                InferenceResult(
-                    run_id=run.id,
-                    sample_key=item["sample_key"],
-                    score=item.get("score"),
-                    verdict=item.get("verdict"),
-                    output_path=item.get("output_path"),
-                    detail_json=item.get("detail_json"),
-                    summary=item.get("summary"),
-                )
-            )
+        adapter = get_adapter(model.backend, model.task_type, model.config_json)
+        reused_items: list[dict] = []
+        if run.source_run_id is not None:
+            # A promoted preview only scores the samples its preview did not reach.
+            source_run = db.get(InferenceRun, run.source_run_id)
+            if source_run is not None:
+                if source_run.archived_at is not None:
+                    rehydrate_run(db, source_run)
+                reused_items = [
+                    {
+                        "sample_key": row.sample_key,
+                        "source_file": row.source_file,
+                        "score": row.score,
+                        "verdict": row.verdict,
+                        "output_path": row.output_path,
+                        "detail_json": row.detail_json,
+                        "summary": row.summary,
+                    }
+                    for row in db.query(InferenceResult).filter(InferenceResult.run_id == source_run.id)
+                ]
 
-        total = len(items)
-        ok_count = sum(1 for item in items if item.get("verdict") == "ok")
-        run.summary_json = {
-            "total": total,
-            "ok": ok_count,
-            "ng": total - ok_count,
-            "output_dir": output_dir.as_posix(),
-        }
-        run.status = "done"
-        run.finished_at = datetime.now(timezone.utc)
+        plan = _sample_plan(db, run, dataset, exclude_keys=frozenset(item["sample_key"] for item in reused_items))
+        items = adapter.run(plan, run.params_json or {})
+
+        _store_run_results(db, run, reused_items + items)
+        if plan.mode != "full":
+            population = estimate_population(plan, adapter.sample_loader)
+            run.summary_json = {
+                **run.summary_json,
+                "preview": estimate_summary(
+                    items,
+                    population,
+                    method="stratified_random" if plan.mode == "random_sample" else "sequential",
+                    stopped_early=plan.mode == "time_budget" and (population is None or len(items) < population),
+                ),
+            }
         db.commit()
     except Exception as exc:  # noqa: BLE001
         run = db.get(InferenceRun, run_id)
@@ -258,12 +796,65 @@ def create_inference_run(
     if db.get(Model, payload.model_id) is None:
         raise HTTPException(status_code=404, detail="Model not found")
 
+    plan_json = None
+    if payload.mode in {"first_n", "random_sample"}:
+        if payload.sample_size is None:
+            raise HTTPException(status_code=400, detail=f"sample_size is required for mode {payload.mode}")
+        plan_json = {"mode": payload.mode, "sample_size": payload.sample_size}
+        if payload.mode == "random_sample":
+            # Persist the seed so the sample (and its promotion) is reproducible.
+            plan_json["seed"] = payload.seed if payload.seed is not None else random.randrange(2**31)
+    elif payload.mode == "time_budget":
+        if payload.time_budget_seconds is None:
+            raise HTTPException(status_code=400, detail="time_budget_seconds is required for mode time_budget")
+        plan_json = {"mode": payload.mode, "time_budget_seconds": payload.time_budget_seconds}
+
+    if payload.range_start is not None or payload.range_stop is not None:
+        # A [start, stop) slice of the manifest's samples, e.g. one part from GET /api/datasets/{id}/manifest.
+        if payload.range_start is None or payload.range_stop is None:
+            raise HTTPException(status_code=400, detail="range_start and range_stop must be given together")
+        if payload.range_start >= payload.range_stop:
+            raise HTTPException(status_code=400, detail="range_start must be less than range_stop")
+        plan_json = {**(plan_json or {"mode": "full"}), "range": [payload.range_start, payload.range_stop]}
+
     run = InferenceRun(
         project_id=payload.project_id,
         dataset_id=payload.dataset_id,
         model_id=payload.model_id,
         status="queued",
         params_json=payload.params,
+        plan_json=plan_json,
+    )
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+
+    background_tasks.add_task(_run_inference_background, run.id)
+    return run
+
+
+@app.post("/api/inference-runs/{run_id}/promote", response_model=InferenceRunRead)
+def promote_inference_run(
+    run_id: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+) -> InferenceRun:
+    preview = db.get(InferenceRun, run_id)
+    if preview is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    if (preview.plan_json or {}).get("mode", "full") == "full":
+        raise HTTPException(status_code=400, detail="Only preview runs can be promoted")
+    if preview.status != "done":
+        raise HTTPException(status_code=409, detail="Preview run has not finished")
+
+    run = InferenceRun(
+        project_id=preview.project_id,
+        dataset_id=preview.dataset_id,
+        model_id=preview.model_id,
+        source_run_id=preview.id,
+        status="queued",
+        params_json=preview.params_json,
+        plan_json={"mode": "full", "range": preview.plan_json["range"]} if "range" in preview.plan_json else None,
     )
     db.add(run)
     db.commit()
@@ -286,16 +877,53 @@ def list_inference_results(
     run_id: str,
     limit: int = Query(default=50, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
+    verdict: str | None = None,
+    score_min: float | None = None,
+    score_max: float | None = None,
+    sample_key_prefix: str | None = Query(default=None, min_length=1),
+    q: str | None = Query(default=None, min_length=1, description="Substring match on sample_key"),
+    source_file: str | None = None,
+    validated: bool | None = None,
+    sort_by: ResultSortField = "created_at",
+    order: SortOrder = "asc",
     db: Session = Depends(get_db),
 ) -> list[InferenceResultRead]:
-    rows = (
-        db.query(InferenceResult)
-        .filter(InferenceResult.run_id == run_id)
-        .order_by(InferenceResult.created_at.asc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
+    if score_min is not None and score_max is not None and score_min > score_max:
+        raise HTTPException(status_code=400, detail="score_min must be <= score_max")
+
+    run = db.get(InferenceRun, run_id)
+    if run is not None and run.archived_at is not None:
+        try:
+            rehydrate_run(db, run)
+        except ArchiveUnavailableError as exc:
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
+        if run.archived_at is not None:
+            raise HTTPException(status_code=409, detail="Run results are being restored from the archive; retry shortly")
+
+    query = db.query(InferenceResult).filter(InferenceResult.run_id == run_id)
+    if verdict:
+        query = query.filter(InferenceResult.verdict == verdict)
+    if score_min is not None:
+        query = query.filter(InferenceResult.score >= score_min)
+    if score_max is not None:
+        query = query.filter(InferenceResult.score <= score_max)
+    if sample_key_prefix:
+        query = filter_sample_key_prefix(query, sample_key_prefix)
+    if q:
+        query = filter_sample_key_contains(query, db, q)
+    if source_file:
+        query = query.filter(InferenceResult.source_file == source_file)
+    if validated is not None:
+        query = filter_validated(query, validated)
+
+    sort_column = getattr(InferenceResult, sort_by)
+    tie_breaker = InferenceResult.id
+    if order == "desc":
+        query = query.order_by(sort_column.desc(), tie_breaker.desc())
+    else:
+        query = query.order_by(sort_column.asc(), tie_breaker.asc())
+
+    rows = query.offset(offset).limit(limit).all()
 
     response: list[InferenceResultRead] = []
     for row in rows:
@@ -307,6 +935,7 @@ def list_inference_results(
                 id=row.id,
                 run_id=row.run_id,
                 sample_key=row.sample_key,
+                source_file=row.source_file,
                 score=row.score,
                 verdict=row.verdict,
                 output_path=row.output_path,
@@ -319,6 +948,151 @@ def list_inference_results(
     return response
 
 
+def _run_comparison_background(comparison_id: str) -> None:
+    db = SessionLocal()
+    try:
+        comparison = db.get(ComparisonRun, comparison_id)
+        if comparison is None:
+            return
+
+        started_at = datetime.now(timezone.utc)
+        comparison.status = "running"
+        comparison.started_at = started_at
+        for run in comparison.runs:
+            run.status = "running"
+            run.started_at = started_at
+        db.commit()
+
+        dataset = db.get(Dataset, comparison.dataset_id)
+        if dataset is None:
+            raise ValueError("Dataset not found")
+
+        adapters = {
+            run.id: get_adapter(run.model.backend, run.model.task_type, run.model.config_json) for run in comparison.runs
+        }
+        params = comparison.params_json or {}
+        items_by_run: dict[str, list[dict]] = {run.id: [] for run in comparison.runs}
+
+        # Each sample is read and decoded once, then scored by every model.
+        loader = next(iter(adapters.values()))
+        chunk_size = max(adapter.chunk_size for adapter in adapters.values())
+        samples = loader.iter_samples(SamplePlan(manifest=build_manifest(db, dataset.id)))
+        for chunk in iter_chunks(samples, chunk_size):
+            for run_id, adapter in adapters.items():
+                items_by_run[run_id].extend(adapter.predict_batch(chunk, params))
+
+        for run in comparison.runs:
+            _store_run_results(db, run, items_by_run[run.id])
+
+        model_ids = {run.id: run.model_id for run in comparison.runs}
+        rows, summary = build_comparison_samples(
+            {model_ids[run_id]: items for run_id, items in items_by_run.items()}
+        )
+        db.query(ComparisonSample).filter(ComparisonSample.comparison_id == comparison.id).delete()
+        if rows:
+            db.execute(insert(ComparisonSample), [{"comparison_id": comparison.id, **row} for row in rows])
+
+        comparison.summary_json = summary
+        comparison.status = "done"
+        comparison.finished_at = datetime.now(timezone.utc)
+        db.commit()
+    except Exception as exc:  # noqa: BLE001
+        db.rollback()
+        comparison = db.get(ComparisonRun, comparison_id)
+        if comparison is not None:
+            finished_at = datetime.now(timezone.utc)
+            for target in [comparison, *comparison.runs]:
+                target.status = "failed"
+                target.error_message = str(exc)
+                target.finished_at = finished_at
+            db.commit()
+    finally:
+        db.close()
+
+
+@app.post("/api/comparison-runs", response_model=ComparisonRunRead)
+def create_comparison_run(
+    payload: ComparisonRunCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+) -> ComparisonRun:
+    if db.get(Project, payload.project_id) is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if db.get(Dataset, payload.dataset_id) is None:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    model_ids = list(dict.fromkeys(payload.model_ids))
+    if len(model_ids) < 2:
+        raise HTTPException(status_code=400, detail="At least two distinct models are required")
+
+    sample_loaders: set[str] = set()
+    for model_id in model_ids:
+        model = db.get(Model, model_id)
+        if model is None:
+            raise HTTPException(status_code=404, detail=f"Model not found: {model_id}")
+        try:
+            sample_loaders.add(validate_adapter_config(model.backend, model.task_type, model.config_json).sample_loader)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if len(sample_loaders) > 1:
+        raise HTTPException(status_code=400, detail="Compared models must consume the same sample type")
+
+    comparison = ComparisonRun(
+        project_id=payload.project_id,
+        dataset_id=payload.dataset_id,
+        status="queued",
+        params_json=payload.params,
+    )
+    db.add(comparison)
+    db.flush()
+    for model_id in model_ids:
+        db.add(
+            InferenceRun(
+                project_id=payload.project_id,
+                dataset_id=payload.dataset_id,
+                model_id=model_id,
+                comparison_id=comparison.id,
+                status="queued",
+                params_json=payload.params,
+            )
+        )
+    db.commit()
+    db.refresh(comparison)
+
+    background_tasks.add_task(_run_comparison_background, comparison.id)
+    return comparison
+
+
+@app.get("/api/comparison-runs/{comparison_id}", response_model=ComparisonRunRead)
+def get_comparison_run(comparison_id: str, db: Session = Depends(get_db)) -> ComparisonRun:
+    comparison = db.get(ComparisonRun, comparison_id)
+    if comparison is None:
+        raise HTTPException(status_code=404, detail="Comparison run not found")
+    return comparison
+
+
+@app.get("/api/comparison-runs/{comparison_id}/diff", response_model=list[ComparisonSampleRead])
+def list_comparison_diff(
+    comparison_id: str,
+    disagree_only: bool = True,
+    sort_by: ComparisonSortField = "score_spread",
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+) -> list[ComparisonSample]:
+    if db.get(ComparisonRun, comparison_id) is None:
+        raise HTTPException(status_code=404, detail="Comparison run not found")
+
+    query = db.query(ComparisonSample).filter(ComparisonSample.comparison_id == comparison_id)
+    if disagree_only:
+        query = query.filter(ComparisonSample.disagree.is_(True))
+    if sort_by == "score_spread":
+        query = query.order_by(ComparisonSample.score_spread.desc(), ComparisonSample.sample_key.asc())
+    else:
+        query = query.order_by(ComparisonSample.sample_key.asc())
+    return query.offset(offset).limit(limit).all()
+
+
 @app.post("/api/validations", response_model=ValidationRead)
 def create_validation(payload: ValidationCreate, db: Session = Depends(get_db)) -> Validation:
     run = db.get(InferenceRun, payload.run_id)
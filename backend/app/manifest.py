@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from .inference.samples import IMAGE_SUFFIXES, ManifestEntry
+from .models import DatasetFile
+
+# Raw uploads live under raw/{shard}/{file_name}; the shard is derived from the
+# name, so re-uploading a file still replaces it and no lookup needs a listing.
+SHARD_WIDTH = 2
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def shard_for(file_name: str) -> str:
+    return hashlib.sha1(file_name.encode("utf-8")).hexdigest()[:SHARD_WIDTH]
+
+
+def sharded_path(raw_dir: Path, file_name: str) -> Path:
+    return raw_dir / shard_for(file_name) / file_name
+
+
+def classify_modality(file_name: str) -> str:
+    suffix = Path(file_name).suffix.lower()
+    if suffix in IMAGE_SUFFIXES:
+        return "image"
+    if suffix == ".csv":
+        return "csv"
+    return "other"
+
+
+def file_sha256(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with file_path.open("rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(db: Session, dataset_id: str) -> list[ManifestEntry]:
+    """Return the dataset's files in name order from DatasetFile rows alone (no directory scans)."""
+    latest: dict[str, DatasetFile] = {}
+    for dataset_file in (
+        db.query(DatasetFile).filter(DatasetFile.dataset_id == dataset_id).order_by(DatasetFile.created_at.asc())
+    ):
+        latest[dataset_file.file_name] = dataset_file
+
+    manifest: list[ManifestEntry] = []
+    for file_name in sorted(latest):
+        dataset_file = latest[file_name]
+        row_count = dataset_file.row_count
+        if row_count is None:
+            # Files uploaded before the manifest columns existed keep their counts in meta_json.
+            row_count = (dataset_file.meta_json or {}).get("row")
+        manifest.append(
+            ManifestEntry(
+                file_name=file_name,
+                path=Path(dataset_file.file_path),
+                modality=dataset_file.modality or classify_modality(file_name),
+                size_bytes=dataset_file.size_bytes,
+                sha256=dataset_file.sha256,
+                row_count=row_count,
+            )
+        )
+    return manifest
+
+
+def split_ranges(total: int, parts: int) -> list[tuple[int, int]]:
+    """Cut ``[0, total)`` into at most ``parts`` non-empty contiguous ranges whose sizes differ by at most one."""
+    if total <= 0:
+        return []
+    parts = max(1, min(parts, total))
+    size, remainder = divmod(total, parts)
+    ranges: list[tuple[int, int]] = []
+    start = 0
+    for index in range(parts):
+        stop = start + size + (1 if index < remainder else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
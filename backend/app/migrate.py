@@ -0,0 +1,67 @@
+"""Schema migration and seeding, run once per deploy instead of on every API boot.
+
+Usage (from ``backend/``)::
+
+    python -m app.migrate
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from . import models  # noqa: F401
+from .database import Base, SessionLocal, engine
+from .result_search import ensure_result_indexes
+from .seed import seed_models
+
+
+def _add_missing_columns(bind: Engine) -> list[str]:
+    """Add nullable columns introduced after a table was first created."""
+    added: list[str] = []
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=conn.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+                added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def _create_missing_indexes(bind: Engine) -> None:
+    # create_all() skips tables that already exist, including their new indexes.
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
+def migrate_database(bind: Engine = engine) -> list[str]:
+    added = _add_missing_columns(bind)
+    Base.metadata.create_all(bind=bind)
+    _create_missing_indexes(bind)
+    ensure_result_indexes(bind)
+    return added
+
+
+def main() -> None:
+    added = migrate_database()
+    for column in added:
+        print(f"[migrate] added column {column}")
+
+    db = SessionLocal()
+    try:
+        seed_models(db)
+    finally:
+        db.close()
+    print("[migrate] schema and seed data are up to date")
+
+
+if __name__ == "__main__":
+    main()
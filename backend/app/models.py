@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, JSON, String, Text, func
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Index, Integer, JSON, String, Text, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import Base
@@ -23,6 +23,26 @@ class Project(Base):
 
     datasets: Mapped[list[Dataset]] = relationship(back_populates="project", cascade="all, delete-orphan")
     inference_runs: Mapped[list[InferenceRun]] = relationship(back_populates="project", cascade="all, delete-orphan")
+    retention_policy: Mapped[RetentionPolicy | None] = relationship(
+        back_populates="project", cascade="all, delete-orphan", uselist=False
+    )
+
+
+class RetentionPolicy(Base):
+    __tablename__ = "retention_policies"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=uuid_str)
+    project_id: Mapped[str] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, unique=True, index=True
+    )
+    enabled: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    archive_after_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    keep_latest_runs: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    project: Mapped[Project] = relationship(back_populates="retention_policy")
 
 
 class Dataset(Base):
@@ -41,19 +61,70 @@ class Dataset(Base):
 
 class DatasetFile(Base):
     __tablename__ = "dataset_files"
+    __table_args__ = (Index("ix_dataset_files_dataset_name", "dataset_id", "file_name"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=uuid_str)
     dataset_id: Mapped[str] = mapped_column(ForeignKey("datasets.id", ondelete="CASCADE"), nullable=False, index=True)
     file_name: Mapped[str] = mapped_column(String(512), nullable=False)
     file_path: Mapped[str] = mapped_column(String(1024), nullable=False)
     media_type: Mapped[str | None] = mapped_column(String(100))
-    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    modality: Mapped[str | None] = mapped_column(String(20))  # image | csv | other
+    sha256: Mapped[str | None] = mapped_column(String(64))
+    row_count: Mapped[int | None] = mapped_column(Integer)  # CSV rows
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
     meta_json: Mapped[dict | None] = mapped_column(JSON)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     dataset: Mapped[Dataset] = relationship(back_populates="files")
 
 
+class UploadSession(Base):
+    __tablename__ = "upload_sessions"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=uuid_str)
+    dataset_id: Mapped[str] = mapped_column(ForeignKey("datasets.id", ondelete="CASCADE"), nullable=False, index=True)
+    chunk_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String(30), nullable=False, default="open")  # open | finalizing | finalized
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    finalized_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))  # last chunk or status change
+
+    files: Mapped[list[UploadSessionFile]] = relationship(
+        back_populates="session", cascade="all, delete-orphan", order_by="UploadSessionFile.file_index"
+    )
+
+
+class UploadSessionFile(Base):
+    __tablename__ = "upload_session_files"
+    __table_args__ = (UniqueConstraint("session_id", "file_index"),)
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=uuid_str)
+    session_id: Mapped[str] = mapped_column(ForeignKey("upload_sessions.id", ondelete="CASCADE"), nullable=False, index=True)
+    file_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    file_name: Mapped[str] = mapped_column(String(512), nullable=False)
+    media_type: Mapped[str | None] = mapped_column(String(100))
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    total_chunks: Mapped[int] = mapped_column(Integer, nullable=False)
+    part_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+
+    session: Mapped[UploadSession] = relationship(back_populates="files")
+    chunks: Mapped[list[UploadChunk]] = relationship(back_populates="session_file", cascade="all, delete-orphan")
+
+
+class UploadChunk(Base):
+    __tablename__ = "upload_chunks"
+    __table_args__ = (UniqueConstraint("session_file_id", "chunk_index"),)
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=uuid_str)
+    session_file_id: Mapped[str] = mapped_column(
+        ForeignKey("upload_session_files.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    session_file: Mapped[UploadSessionFile] = relationship(back_populates="chunks")
+
+
 class Model(Base):
     __tablename__ = "models"
 
@@ -62,6 +133,7 @@ class Model(Base):
     task_type: Mapped[str] = mapped_column(String(50), nullable=False)  # vision | timeseries | mixed
     backend: Mapped[str] = mapped_column(String(100), nullable=False)  # adapter key, e.g. dummy
     version: Mapped[str] = mapped_column(String(50), nullable=False)
+    config_json: Mapped[dict | None] = mapped_column(JSON)  # adapter settings, e.g. remote url / batching
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     inference_runs: Mapped[list[InferenceRun]] = relationship(back_populates="model")
@@ -74,27 +146,82 @@ class InferenceRun(Base):
     project_id: Mapped[str] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
     dataset_id: Mapped[str] = mapped_column(ForeignKey("datasets.id", ondelete="CASCADE"), nullable=False, index=True)
     model_id: Mapped[str] = mapped_column(ForeignKey("models.id"), nullable=False, index=True)
+    comparison_id: Mapped[str | None] = mapped_column(
+        ForeignKey("comparison_runs.id", ondelete="CASCADE"), index=True
+    )
+    source_run_id: Mapped[str | None] = mapped_column(ForeignKey("inference_runs.id", ondelete="SET NULL"))
     status: Mapped[str] = mapped_column(String(30), nullable=False, default="queued")
     params_json: Mapped[dict | None] = mapped_column(JSON)
+    plan_json: Mapped[dict | None] = mapped_column(JSON)  # mode/sample_size/time_budget_seconds/seed; None = full
     summary_json: Mapped[dict | None] = mapped_column(JSON)
     error_message: Mapped[str | None] = mapped_column(Text)
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    archive_path: Mapped[str | None] = mapped_column(String(1024))
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    rehydrated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     project: Mapped[Project] = relationship(back_populates="inference_runs")
     dataset: Mapped[Dataset] = relationship(back_populates="inference_runs")
     model: Mapped[Model] = relationship(back_populates="inference_runs")
+    comparison: Mapped[ComparisonRun | None] = relationship(back_populates="runs")
     results: Mapped[list[InferenceResult]] = relationship(back_populates="run", cascade="all, delete-orphan")
     validations: Mapped[list[Validation]] = relationship(back_populates="run", cascade="all, delete-orphan")
 
 
+class ComparisonRun(Base):
+    __tablename__ = "comparison_runs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=uuid_str)
+    project_id: Mapped[str] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    dataset_id: Mapped[str] = mapped_column(ForeignKey("datasets.id", ondelete="CASCADE"), nullable=False, index=True)
+    status: Mapped[str] = mapped_column(String(30), nullable=False, default="queued")
+    params_json: Mapped[dict | None] = mapped_column(JSON)
+    summary_json: Mapped[dict | None] = mapped_column(JSON)
+    error_message: Mapped[str | None] = mapped_column(Text)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    runs: Mapped[list[InferenceRun]] = relationship(back_populates="comparison", cascade="all, delete-orphan")
+    samples: Mapped[list[ComparisonSample]] = relationship(back_populates="comparison", cascade="all, delete-orphan")
+
+
+class ComparisonSample(Base):
+    __tablename__ = "comparison_samples"
+    __table_args__ = (
+        Index("ix_comparison_samples_comparison_key", "comparison_id", "sample_key"),
+        Index("ix_comparison_samples_comparison_disagree", "comparison_id", "disagree", "score_spread"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=uuid_str)
+    comparison_id: Mapped[str] = mapped_column(
+        ForeignKey("comparison_runs.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    sample_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    verdicts: Mapped[dict] = mapped_column(JSON, nullable=False)  # model_id -> verdict
+    scores: Mapped[dict] = mapped_column(JSON, nullable=False)  # model_id -> score
+    disagree: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    score_spread: Mapped[float | None] = mapped_column(Float)
+
+    comparison: Mapped[ComparisonRun] = relationship(back_populates="samples")
+
+
 class InferenceResult(Base):
     __tablename__ = "inference_results"
+    __table_args__ = (
+        Index("ix_inference_results_run_created", "run_id", "created_at"),
+        Index("ix_inference_results_run_score", "run_id", "score"),
+        Index("ix_inference_results_run_verdict_score", "run_id", "verdict", "score"),
+        Index("ix_inference_results_run_sample_key", "run_id", "sample_key"),
+        Index("ix_inference_results_run_source_file", "run_id", "source_file", "sample_key"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=uuid_str)
     run_id: Mapped[str] = mapped_column(ForeignKey("inference_runs.id", ondelete="CASCADE"), nullable=False, index=True)
     sample_key: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    source_file: Mapped[str | None] = mapped_column(String(512))
     score: Mapped[float | None] = mapped_column(Float)
     verdict: Mapped[str | None] = mapped_column(String(50))
     output_path: Mapped[str | None] = mapped_column(String(1024))
@@ -107,6 +234,7 @@ class InferenceResult(Base):
 
 class Validation(Base):
     __tablename__ = "validations"
+    __table_args__ = (Index("ix_validations_run_sample_key", "run_id", "sample_key"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=uuid_str)
     run_id: Mapped[str] = mapped_column(ForeignKey("inference_runs.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import math
+
+from .inference.samples import SamplePlan, count_samples
+
+Z_95 = 1.959964
+
+
+def estimate_population(plan: SamplePlan, sample_loader: str) -> int | None:
+    """Count the samples in the plan's range from the manifest, without touching the files."""
+    if sample_loader == "csv_rows" and any(entry.row_count is None for entry in plan.entries(sample_loader)):
+        return None
+    return count_samples(plan, sample_loader)
+
+
+def _wilson_interval(successes: int, n: int, z: float) -> tuple[float, float]:
+    p = successes / n
+    denominator = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def estimate_summary(items: list[dict], population: int | None, method: str, stopped_early: bool) -> dict:
+    """Estimate full-dataset metrics from a preview's scored samples, with 95% confidence intervals.
+
+    ``method`` is ``stratified_random`` when samples were drawn at random; for
+    ``sequential`` previews (first-N / time budget) the intervals assume the
+    scored prefix is representative, which dataset order may not guarantee.
+    """
+    n = len(items)
+    estimate: dict = {"method": method, "sampled": n, "population": population, "stopped_early": stopped_early}
+    if n == 0:
+        return estimate
+
+    # Finite population correction shrinks the intervals as the sample approaches the whole dataset.
+    fpc = 1.0
+    if population and population > 1:
+        fpc = math.sqrt(max(0.0, (population - n) / (population - 1)))
+    z = Z_95 * fpc
+
+    ok_count = sum(1 for item in items if item.get("verdict") == "ok")
+    ok_low, ok_high = _wilson_interval(ok_count, n, z) if z > 0 else (ok_count / n, ok_count / n)
+    estimate["ok_rate"] = round(ok_count / n, 4)
+    estimate["ok_rate_ci95"] = [round(ok_low, 4), round(ok_high, 4)]
+    if population:
+        estimate["estimated_ok"] = round(ok_count / n * population)
+        estimate["estimated_ok_ci95"] = [math.floor(ok_low * population), math.ceil(ok_high * population)]
+
+    scores = [item["score"] for item in items if item.get("score") is not None]
+    if scores:
+        mean = sum(scores) / len(scores)
+        variance = sum((score - mean) ** 2 for score in scores) / (len(scores) - 1) if len(scores) > 1 else 0.0
+        margin = z * math.sqrt(variance / len(scores))
+        estimate["score_mean"] = round(mean, 4)
+        estimate["score_mean_ci95"] = [round(mean - margin, 4), round(mean + margin, 4)]
+    return estimate
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import exists, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Query, Session
+
+from .models import InferenceResult, Validation
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_KEY_FTS_TABLE = "inference_results_fts"
+# The trigram tokenizer indexes every 3-character window, so shorter
+# substrings cannot be answered from the FTS index.
+FTS_MIN_QUERY_LENGTH = 3
+
+_SQLITE_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SAMPLE_KEY_FTS_TABLE}
+    USING fts5(sample_key, content='inference_results', content_rowid='rowid', tokenize='trigram')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS inference_results_fts_ai AFTER INSERT ON inference_results BEGIN
+        INSERT INTO {SAMPLE_KEY_FTS_TABLE}(rowid, sample_key) VALUES (new.rowid, new.sample_key);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS inference_results_fts_ad AFTER DELETE ON inference_results BEGIN
+        INSERT INTO {SAMPLE_KEY_FTS_TABLE}({SAMPLE_KEY_FTS_TABLE}, rowid, sample_key)
+        VALUES ('delete', old.rowid, old.sample_key);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS inference_results_fts_au AFTER UPDATE OF sample_key ON inference_results BEGIN
+        INSERT INTO {SAMPLE_KEY_FTS_TABLE}({SAMPLE_KEY_FTS_TABLE}, rowid, sample_key)
+        VALUES ('delete', old.rowid, old.sample_key);
+        INSERT INTO {SAMPLE_KEY_FTS_TABLE}(rowid, sample_key) VALUES (new.rowid, new.sample_key);
+    END
+    """,
+]
+
+_fts_available = False
+
+
+def _ensure_sqlite_fts(conn: Connection) -> None:
+    created = not inspect(conn).has_table(SAMPLE_KEY_FTS_TABLE)
+    for statement in _SQLITE_FTS_DDL:
+        conn.execute(text(statement))
+    if created:
+        conn.execute(text(f"INSERT INTO {SAMPLE_KEY_FTS_TABLE}({SAMPLE_KEY_FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def ensure_result_indexes(engine: Engine) -> None:
+    """Create the filter indexes (and the SQLite sample key FTS index) on existing databases."""
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in (InferenceResult.__table__, Validation.__table__):
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for index in table.indexes:
+                # Columns added after the table was created (e.g. source_file) only
+                # exist once app.migrate has run; skip their indexes until then.
+                if all(column.name in existing for column in index.columns):
+                    index.create(conn, checkfirst=True)
+
+    if engine.dialect.name != "sqlite":
+        return
+    # FTS5 with the trigram tokenizer needs SQLite >= 3.34 built with FTS5. It is
+    # optional: without it, sample key search falls back to LIKE.
+    try:
+        with engine.begin() as conn:
+            _ensure_sqlite_fts(conn)
+    except OperationalError as exc:
+        logger.warning("sample key FTS index unavailable, substring search will use LIKE: %s", exc)
+
+
+def has_sample_key_fts(db: Session) -> bool:
+    # Only a positive answer is cached: the table may be created by a migration
+    # that runs after this replica booted.
+    global _fts_available
+    if not _fts_available:
+        bind = db.get_bind()
+        _fts_available = bind.dialect.name == "sqlite" and inspect(bind).has_table(SAMPLE_KEY_FTS_TABLE)
+    return _fts_available
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    """Smallest string above every string starting with ``prefix``, in code point order."""
+    chars = list(prefix)
+    while chars:
+        code_point = ord(chars.pop()) + 1
+        if code_point == 0xD800:  # surrogates cannot be stored as UTF-8
+            code_point = 0xE000
+        if code_point <= 0x10FFFF:
+            return "".join(chars) + chr(code_point)
+    return None
+
+
+def filter_sample_key_prefix(query: Query, prefix: str) -> Query:
+    # A range predicate (rather than LIKE) keeps the (run_id, sample_key) index usable.
+    query = query.filter(InferenceResult.sample_key >= prefix)
+    upper_bound = _prefix_upper_bound(prefix)
+    if upper_bound is not None:
+        query = query.filter(InferenceResult.sample_key < upper_bound)
+    return query
+
+
+def filter_sample_key_contains(query: Query, db: Session, needle: str) -> Query:
+    if len(needle) >= FTS_MIN_QUERY_LENGTH and has_sample_key_fts(db):
+        phrase = '"' + needle.replace('"', '""') + '"'
+        return query.filter(
+            text(
+                f"inference_results.rowid IN (SELECT rowid FROM {SAMPLE_KEY_FTS_TABLE} "
+                f"WHERE {SAMPLE_KEY_FTS_TABLE} MATCH :sample_key_phrase)"
+            ).bindparams(sample_key_phrase=phrase)
+        )
+    return query.filter(InferenceResult.sample_key.like(f"%{_escape_like(needle)}%", escape="\\"))
+
+
+def filter_validated(query: Query, validated: bool) -> Query:
+    is_validated = exists().where(
+        Validation.run_id == InferenceResult.run_id,
+        Validation.sample_key == InferenceResult.sample_key,
+    )
+    return query.filter(is_validated if validated else ~is_validated)
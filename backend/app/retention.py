@@ -0,0 +1,380 @@
+"""Storage lifecycle: archive old runs out of the hot results table and keep the database compact.
+
+Usage (from ``backend/``)::
+
+    python -m app.retention report
+    python -m app.retention compact
+    python -m app.retention vacuum
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session
+
+from .config import STORAGE_ROOT, get_settings
+from .database import SessionLocal, engine
+from .models import InferenceResult, InferenceRun, Project, RetentionPolicy, UploadSession
+from .schemas import ProjectStorageReport, RetentionPolicyRead, StorageReport
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FILE_NAME = "results.jsonl.gz"
+REHYDRATE_BATCH_SIZE = 1000
+# Staleness counts from the last chunk or status change, so a "finalizing" session
+# only goes stale when the finalize that claimed it crashed.
+STALE_UPLOAD_STATUSES = ("open", "finalizing")
+RESULT_COLUMNS = [column.name for column in InferenceResult.__table__.columns]
+
+
+class ArchiveUnavailableError(RuntimeError):
+    pass
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC.
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.stat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                continue
+    return total
+
+
+def run_storage_dir(run: InferenceRun) -> Path:
+    return STORAGE_ROOT / run.project_id / "runs" / run.id
+
+
+def get_effective_policy(db: Session, project_id: str) -> RetentionPolicyRead:
+    policy = db.query(RetentionPolicy).filter(RetentionPolicy.project_id == project_id).one_or_none()
+    if policy is None:
+        settings = get_settings()
+        return RetentionPolicyRead(
+            project_id=project_id,
+            enabled=True,
+            archive_after_days=settings.retention_archive_after_days,
+            keep_latest_runs=settings.retention_keep_latest_runs,
+            is_default=True,
+        )
+    return RetentionPolicyRead(
+        project_id=project_id,
+        enabled=policy.enabled,
+        archive_after_days=policy.archive_after_days,
+        keep_latest_runs=policy.keep_latest_runs,
+        is_default=False,
+    )
+
+
+def find_archivable_runs(db: Session, policy: RetentionPolicyRead, now: datetime) -> list[InferenceRun]:
+    if not policy.enabled:
+        return []
+
+    finished_runs = (
+        db.query(InferenceRun)
+        .filter(InferenceRun.project_id == policy.project_id, InferenceRun.status == "done")
+        .order_by(InferenceRun.finished_at.desc())
+        .all()
+    )
+    cutoff = now - timedelta(days=policy.archive_after_days)
+    archivable: list[InferenceRun] = []
+    for run in finished_runs[policy.keep_latest_runs :]:
+        if run.archived_at is not None:
+            continue
+        # A run that was read back from its archive stays hot for another full period.
+        last_active = run.rehydrated_at or run.finished_at
+        if last_active is not None and _utc(last_active) < cutoff:
+            archivable.append(run)
+    return archivable
+
+
+def archive_run(db: Session, run: InferenceRun) -> int:
+    """Move a run's results into a gzip JSONL archive and drop them from the hot table."""
+    archive_path = run_storage_dir(run) / ARCHIVE_FILE_NAME
+    archived_rows = db.query(InferenceResult).filter(InferenceResult.run_id == run.id).count()
+
+    # A rehydrated run still has its archive on disk, so re-archiving only drops the rows.
+    if run.archive_path is None or not Path(run.archive_path).exists():
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = archive_path.with_suffix(".tmp")
+        rows = (
+            db.query(InferenceResult)
+            .filter(InferenceResult.run_id == run.id)
+            .order_by(InferenceResult.created_at.asc(), InferenceResult.id.asc())
+            .yield_per(REHYDRATE_BATCH_SIZE)
+        )
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as out:
+            for row in rows:
+                record = {column: getattr(row, column) for column in RESULT_COLUMNS}
+                record["created_at"] = row.created_at.isoformat()
+                out.write(json.dumps(record, ensure_ascii=False))
+                out.write("\n")
+        tmp_path.replace(archive_path)
+        run.archive_path = archive_path.as_posix()
+
+    db.query(InferenceResult).filter(InferenceResult.run_id == run.id).delete(synchronize_session=False)
+    shutil.rmtree(run_storage_dir(run) / "outputs", ignore_errors=True)
+    run.archived_at = datetime.now(timezone.utc)
+    db.commit()
+    return archived_rows
+
+
+def rehydrate_run(db: Session, run: InferenceRun) -> None:
+    """Load an archived run's results back into the hot table so reads work unchanged.
+
+    Raises ``ArchiveUnavailableError`` when the archive file is missing or corrupt.
+    If another session is rehydrating the same run, this returns with
+    ``run.archived_at`` still set and the caller should retry later.
+    """
+    if run.archived_at is None or run.archive_path is None:
+        return
+
+    try:
+        with gzip.open(run.archive_path, "rt", encoding="utf-8") as f:
+            batch: list[dict] = []
+            for line in f:
+                record = json.loads(line)
+                record["created_at"] = datetime.fromisoformat(record["created_at"])
+                batch.append(record)
+                if len(batch) >= REHYDRATE_BATCH_SIZE:
+                    db.execute(insert(InferenceResult), batch)
+                    batch = []
+            if batch:
+                db.execute(insert(InferenceResult), batch)
+
+        run.archived_at = None
+        run.rehydrated_at = datetime.now(timezone.utc)
+        db.commit()
+    except (OSError, EOFError, ValueError) as exc:
+        # gzip/OS errors for a missing or truncated file, ValueError for a corrupt record.
+        db.rollback()
+        raise ArchiveUnavailableError(f"Archive for run {run.id} is missing or unreadable: {exc}") from exc
+    except (IntegrityError, OperationalError):
+        # Another request rehydrated the same run first (IntegrityError), or is
+        # still doing so and holds the SQLite write lock (OperationalError).
+        db.rollback()
+        db.refresh(run)
+
+
+def _upload_last_activity():
+    # Sessions created before updated_at existed fall back to their creation time.
+    return func.coalesce(UploadSession.updated_at, UploadSession.created_at)
+
+
+def find_stale_upload_sessions(db: Session, now: datetime) -> list[UploadSession]:
+    cutoff = now - timedelta(hours=get_settings().upload_session_ttl_hours)
+    return (
+        db.query(UploadSession)
+        .filter(UploadSession.status.in_(STALE_UPLOAD_STATUSES), _upload_last_activity() < cutoff)
+        .all()
+    )
+
+
+def cleanup_stale_uploads(db: Session, now: datetime) -> tuple[int, int]:
+    cutoff = now - timedelta(hours=get_settings().upload_session_ttl_hours)
+    part_paths: list[Path] = []
+    removed = 0
+    for upload_session in find_stale_upload_sessions(db, now):
+        # Re-check staleness in the write so a chunk or finalize that landed since the query keeps the session.
+        claimed = db.execute(
+            update(UploadSession)
+            .where(
+                UploadSession.id == upload_session.id,
+                UploadSession.status == upload_session.status,
+                _upload_last_activity() < cutoff,
+            )
+            .values(status="expired")
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not claimed:
+            continue
+        part_paths.extend(Path(session_file.part_path) for session_file in upload_session.files)
+        db.delete(upload_session)
+        removed += 1
+    db.commit()
+
+    freed = 0
+    for part_path in part_paths:
+        if part_path.exists():
+            freed += part_path.stat().st_size
+            part_path.unlink()
+    return removed, freed
+
+
+def apply_retention(db: Session) -> dict:
+    now = datetime.now(timezone.utc)
+    archived_runs = 0
+    archived_rows = 0
+    for (project_id,) in db.query(Project.id).all():
+        for run in find_archivable_runs(db, get_effective_policy(db, project_id), now):
+            archived_rows += archive_run(db, run)
+            archived_runs += 1
+
+    stale_sessions, stale_bytes = cleanup_stale_uploads(db, now)
+    return {
+        "archived_runs": archived_runs,
+        "archived_rows": archived_rows,
+        "stale_upload_sessions": stale_sessions,
+        "stale_upload_bytes": stale_bytes,
+    }
+
+
+def database_size(bind: Engine) -> tuple[int, int]:
+    if bind.dialect.name != "sqlite":
+        return 0, 0
+    with bind.connect() as conn:
+        page_size = conn.exec_driver_sql("PRAGMA page_size").scalar() or 0
+        page_count = conn.exec_driver_sql("PRAGMA page_count").scalar() or 0
+        freelist_count = conn.exec_driver_sql("PRAGMA freelist_count").scalar() or 0
+    return page_size * page_count, page_size * freelist_count
+
+
+def optimize_database(bind: Engine, force_vacuum: bool = False) -> dict:
+    """Refresh planner statistics, and VACUUM once enough pages sit on the freelist."""
+    if bind.dialect.name != "sqlite":
+        return {"analyzed": False, "vacuumed": False}
+
+    total_bytes, free_bytes = database_size(bind)
+    should_vacuum = force_vacuum or (
+        total_bytes > 0 and free_bytes / total_bytes >= get_settings().vacuum_freelist_ratio
+    )
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("ANALYZE")
+        if should_vacuum:
+            conn.exec_driver_sql("VACUUM")
+    return {"analyzed": True, "vacuumed": should_vacuum, "freed_bytes": free_bytes if should_vacuum else 0}
+
+
+def build_storage_report(db: Session) -> StorageReport:
+    now = datetime.now(timezone.utc)
+    projects: list[ProjectStorageReport] = []
+    for (project_id,) in db.query(Project.id).order_by(Project.created_at.asc()).all():
+        policy = get_effective_policy(db, project_id)
+        archivable = find_archivable_runs(db, policy, now)
+        run_ids = [run.id for run in archivable]
+
+        result_rows, result_bytes = 0, 0
+        if run_ids:
+            result_rows, result_bytes = (
+                db.query(
+                    func.count(InferenceResult.id),
+                    func.coalesce(
+                        func.sum(
+                            func.length(InferenceResult.sample_key)
+                            + func.coalesce(func.length(InferenceResult.output_path), 0)
+                            + func.coalesce(func.length(InferenceResult.detail_json), 0)
+                            + func.coalesce(func.length(InferenceResult.summary), 0)
+                            + 64
+                        ),
+                        0,
+                    ),
+                )
+                .filter(InferenceResult.run_id.in_(run_ids))
+                .one()
+            )
+
+        archived = (
+            db.query(InferenceRun)
+            .filter(InferenceRun.project_id == project_id, InferenceRun.archived_at.is_not(None))
+            .all()
+        )
+        projects.append(
+            ProjectStorageReport(
+                project_id=project_id,
+                policy=policy,
+                archivable_runs=len(archivable),
+                archivable_result_rows=result_rows,
+                archivable_result_bytes=result_bytes,
+                archivable_output_bytes=sum(_dir_size(run_storage_dir(run) / "outputs") for run in archivable),
+                archived_runs=len(archived),
+                archive_bytes=sum(
+                    Path(run.archive_path).stat().st_size
+                    for run in archived
+                    if run.archive_path and Path(run.archive_path).exists()
+                ),
+            )
+        )
+
+    stale_sessions = find_stale_upload_sessions(db, now)
+    stale_bytes = sum(
+        Path(session_file.part_path).stat().st_size
+        for upload_session in stale_sessions
+        for session_file in upload_session.files
+        if Path(session_file.part_path).exists()
+    )
+
+    database_bytes, database_free_bytes = database_size(db.get_bind())
+    return StorageReport(
+        database_bytes=database_bytes,
+        database_free_bytes=database_free_bytes,
+        stale_upload_sessions=len(stale_sessions),
+        stale_upload_bytes=stale_bytes,
+        projects=projects,
+        reclaimable_bytes=database_free_bytes
+        + stale_bytes
+        + sum(project.archivable_result_bytes + project.archivable_output_bytes for project in projects),
+    )
+
+
+def run_maintenance_cycle(force_vacuum: bool = False) -> dict:
+    db = SessionLocal()
+    try:
+        summary = apply_retention(db)
+    finally:
+        db.close()
+    summary.update(optimize_database(engine, force_vacuum=force_vacuum))
+    logger.info("maintenance cycle finished: %s", summary)
+    return summary
+
+
+def start_maintenance_scheduler(interval_seconds: int) -> threading.Event:
+    """Run a maintenance cycle every ``interval_seconds`` on a daemon thread until the returned event is set."""
+    stop = threading.Event()
+
+    def loop() -> None:
+        while not stop.wait(interval_seconds):
+            try:
+                run_maintenance_cycle()
+            except Exception:  # noqa: BLE001
+                logger.exception("maintenance cycle failed")
+
+    threading.Thread(target=loop, name="storage-maintenance", daemon=True).start()
+    return stop
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Storage retention and database maintenance.")
+    parser.add_argument("command", choices=["report", "compact", "vacuum"])
+    args = parser.parse_args()
+
+    if args.command == "report":
+        db = SessionLocal()
+        try:
+            print(build_storage_report(db).model_dump_json(indent=2))
+        finally:
+            db.close()
+    elif args.command == "compact":
+        print(json.dumps(run_maintenance_cycle(), indent=2))
+    else:
+        print(json.dumps(optimize_database(engine, force_vacuum=True), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -35,26 +35,101 @@ class DatasetFileRead(BaseModel):
     file_name: str
     file_path: str
     media_type: str | None
+    modality: str | None
+    sha256: str | None
+    row_count: int | None
     size_bytes: int
     meta_json: dict | None
     created_at: datetime
     static_url: str
 
 
+class ManifestEntryRead(BaseModel):
+    file_name: str
+    file_path: str
+    modality: str
+    size_bytes: int
+    sha256: str | None
+    row_count: int | None
+
+
+class DatasetManifestRead(BaseModel):
+    dataset_id: str
+    files: list[ManifestEntryRead]
+    total_bytes: int
+    sample_counts: dict[str, int]  # sample loader -> number of samples
+    splits: dict[str, list[tuple[int, int]]]  # sample loader -> [start, stop) ranges for parallel runs
+
+
+class UploadFileSpec(BaseModel):
+    file_name: str
+    size_bytes: int = Field(ge=0)
+    media_type: str | None = None
+
+
+class UploadSessionCreate(BaseModel):
+    files: list[UploadFileSpec] = Field(min_length=1)
+    chunk_size: int | None = Field(default=None, gt=0)
+
+
+class UploadSessionFileRead(BaseModel):
+    file_index: int
+    file_name: str
+    media_type: str | None
+    size_bytes: int
+    total_chunks: int
+    received_chunks: list[int]
+
+
+class UploadSessionRead(BaseModel):
+    id: str
+    dataset_id: str
+    chunk_size: int
+    status: str
+    files: list[UploadSessionFileRead]
+    created_at: datetime
+    finalized_at: datetime | None
+
+
+class UploadChunkAck(BaseModel):
+    session_id: str
+    file_index: int
+    chunk_index: int
+    size_bytes: int
+
+
+class ModelCreate(BaseModel):
+    name: str
+    task_type: str
+    backend: str
+    version: str
+    config: dict[str, Any] | None = None
+
+
 class ModelRead(BaseModel):
     id: str
     name: str
     task_type: str
     backend: str
     version: str
+    config_json: dict | None
     created_at: datetime
 
 
+RunMode = Literal["full", "first_n", "random_sample", "time_budget"]
+
+
 class InferenceRunCreate(BaseModel):
     project_id: str
     dataset_id: str
     model_id: str
     params: dict[str, Any] | None = Field(default_factory=dict)
+    mode: RunMode = "full"
+    sample_size: int | None = Field(default=None, gt=0)
+    time_budget_seconds: float | None = Field(default=None, gt=0)
+    seed: int | None = None
+    range_start: int | None = Field(default=None, ge=0)
+    range_stop: int | None = Field(default=None, gt=0)
 
 
 class InferenceRunRead(BaseModel):
@@ -62,19 +137,56 @@ class InferenceRunRead(BaseModel):
     project_id: str
     dataset_id: str
     model_id: str
+    comparison_id: str | None
+    source_run_id: str | None
     status: str
     params_json: dict | None
+    plan_json: dict | None
     summary_json: dict | None
     error_message: str | None
     started_at: datetime | None
     finished_at: datetime | None
+    archived_at: datetime | None
     created_at: datetime
 
 
+class ComparisonRunCreate(BaseModel):
+    project_id: str
+    dataset_id: str
+    model_ids: list[str] = Field(min_length=2)
+    params: dict[str, Any] | None = Field(default_factory=dict)
+
+
+class ComparisonRunRead(BaseModel):
+    id: str
+    project_id: str
+    dataset_id: str
+    status: str
+    params_json: dict | None
+    summary_json: dict | None
+    error_message: str | None
+    started_at: datetime | None
+    finished_at: datetime | None
+    created_at: datetime
+    runs: list[InferenceRunRead]
+
+
+class ComparisonSampleRead(BaseModel):
+    sample_key: str
+    verdicts: dict[str, str | None]
+    scores: dict[str, float | None]
+    disagree: bool
+    score_spread: float | None
+
+
+ComparisonSortField = Literal["sample_key", "score_spread"]
+
+
 class InferenceResultRead(BaseModel):
     id: str
     run_id: str
     sample_key: str
+    source_file: str | None
     score: float | None
     verdict: str | None
     output_path: str | None
@@ -84,6 +196,10 @@ class InferenceResultRead(BaseModel):
     static_url: str | None
 
 
+ResultSortField = Literal["created_at", "score", "sample_key"]
+SortOrder = Literal["asc", "desc"]
+
+
 class ValidationCreate(BaseModel):
     run_id: str
     sample_key: str
@@ -98,3 +214,37 @@ class ValidationRead(BaseModel):
     human_verdict: str
     comment: str | None
     created_at: datetime
+
+
+class RetentionPolicyUpdate(BaseModel):
+    enabled: bool = True
+    archive_after_days: int = Field(ge=0)
+    keep_latest_runs: int = Field(ge=0)
+
+
+class RetentionPolicyRead(BaseModel):
+    project_id: str
+    enabled: bool
+    archive_after_days: int
+    keep_latest_runs: int
+    is_default: bool
+
+
+class ProjectStorageReport(BaseModel):
+    project_id: str
+    policy: RetentionPolicyRead
+    archivable_runs: int
+    archivable_result_rows: int
+    archivable_result_bytes: int  # estimated from column lengths
+    archivable_output_bytes: int
+    archived_runs: int
+    archive_bytes: int
+
+
+class StorageReport(BaseModel):
+    database_bytes: int
+    database_free_bytes: int
+    stale_upload_sessions: int
+    stale_upload_bytes: int
+    projects: list[ProjectStorageReport]
+    reclaimable_bytes: int
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import argparse
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib import error, request
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# The framework is imported first and timed separately: app.main cannot boot
+# faster than fastapi + sqlalchemy, so only the remainder is the app's own cost.
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import fastapi, fastapi.staticfiles, pydantic_settings, sqlalchemy.orm
+framework = time.perf_counter() - started
+import app.main
+elapsed = time.perf_counter() - started
+adapters = sorted(name for name in sys.modules if name.startswith("app.inference.adapters."))
+print(json.dumps({"seconds": elapsed, "framework_seconds": framework, "adapters": adapters}))
+"""
+
+
+def log(msg: str) -> None:
+    print(f"[bench] {msg}")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import() -> tuple[float, float, list[str]]:
+    import json
+
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=BACKEND_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    payload = json.loads(output.strip().splitlines()[-1])
+    return payload["seconds"], payload["framework_seconds"], payload["adapters"]
+
+
+def measure_boot(timeout: float) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with request.urlopen(f"http://127.0.0.1:{port}/health", timeout=0.5) as resp:
+                    if resp.status == 200:
+                        return time.perf_counter() - started
+            except (error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise RuntimeError(f"server did not become healthy within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def summarize(label: str, samples: list[float]) -> float:
+    median = statistics.median(samples)
+    log(f"{label}: min={min(samples):.3f}s median={median:.3f}s max={max(samples):.3f}s (n={len(samples)})")
+    return median
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure API cold-start time.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.0, help="fail if median boot-to-healthy exceeds this")
+    parser.add_argument(
+        "--overhead-budget",
+        type=float,
+        default=0.25,
+        help="fail if app.main adds more than this on top of importing the framework",
+    )
+    args = parser.parse_args()
+
+    import_samples: list[float] = []
+    overhead_samples: list[float] = []
+    for _ in range(args.runs):
+        seconds, framework_seconds, adapters = measure_import()
+        if adapters:
+            log(f"FAILED: adapters imported eagerly: {', '.join(adapters)}")
+            return 1
+        import_samples.append(seconds)
+        overhead_samples.append(seconds - framework_seconds)
+    summarize("import app.main", import_samples)
+    overhead_median = summarize("app overhead over framework import", overhead_samples)
+    if overhead_median > args.overhead_budget:
+        log(f"FAILED: app import overhead {overhead_median:.3f}s exceeds budget {args.overhead_budget:.3f}s")
+        return 1
+
+    boot_median = summarize("boot to /health", [measure_boot(timeout=30) for _ in range(args.runs)])
+    if boot_median > args.budget:
+        log(f"FAILED: median boot {boot_median:.3f}s exceeds budget {args.budget:.3f}s")
+        return 1
+
+    log("startup benchmark succeeded")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Local stand-in for a remote model server (see app/inference/remote.py for the protocol).
+
+    python scripts/mock_model_server.py --port 9000 --latency-ms 20 --fail-rate 0.05
+
+Register a model against it with
+``POST /api/models {"name": ..., "task_type": "vision", "backend": "remote", "version": "v1",
+"config": {"url": "http://localhost:9000", "model_name": "mock"}}``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STATS = {"requests": 0, "samples": 0, "connections": 0, "max_batch": 0, "injected_failures": 0}
+STATS_LOCK = threading.Lock()
+
+
+def log(msg: str) -> None:
+    print(f"[mock-model] {msg}")
+
+
+def score_input(item: dict) -> float:
+    digest = hashlib.sha256(json.dumps(item.get("data"), sort_keys=True).encode("utf-8")).digest()
+    return round(int.from_bytes(digest[:4], "big") / 2**32, 4)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency_seconds = 0.0
+    fail_rate = 0.0
+
+    def setup(self) -> None:
+        super().setup()
+        with STATS_LOCK:
+            STATS["connections"] += 1
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        pass
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/v2/health/ready":
+            self._send_json(200, {"ready": True})
+        elif self.path == "/stats":
+            with STATS_LOCK:
+                self._send_json(200, dict(STATS))
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length", 0))
+        request_body = self.rfile.read(length)
+        if not (self.path.startswith("/v2/models/") and self.path.endswith("/infer")):
+            self._send_json(404, {"error": "not found"})
+            return
+
+        if random.random() < self.fail_rate:
+            with STATS_LOCK:
+                STATS["injected_failures"] += 1
+            self._send_json(503, {"error": "injected failure"})
+            return
+
+        inputs = json.loads(request_body)["inputs"]
+        time.sleep(self.latency_seconds)
+        with STATS_LOCK:
+            STATS["requests"] += 1
+            STATS["samples"] += len(inputs)
+            STATS["max_batch"] = max(STATS["max_batch"], len(inputs))
+
+        outputs = [{"score": score_input(item), "detail": {"batch_size": len(inputs)}} for item in inputs]
+        self._send_json(200, {"outputs": outputs})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in model server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="simulated inference time per batch")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    Handler.latency_seconds = args.latency_ms / 1000
+    Handler.fail_rate = args.fail_rate
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    log(f"listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
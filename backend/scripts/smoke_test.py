@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import json
 import mimetypes
+import random
+import socket
+import subprocess
 import sys
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from urllib import request
+from urllib import error, request
 
 BASE_URL = "http://localhost:8000"
 
@@ -31,6 +36,28 @@ def get_json(path: str) -> dict | list:
         return json.loads(resp.read().decode("utf-8"))
 
 
+def put_json(path: str, payload: dict) -> dict:
+    req = request.Request(
+        f"{BASE_URL}{path}",
+        method="PUT",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with request.urlopen(req) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def put_bytes(path: str, data: bytes) -> dict:
+    req = request.Request(
+        f"{BASE_URL}{path}",
+        method="PUT",
+        data=data,
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    with request.urlopen(req) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
 def post_multipart(path: str, files: list[Path]) -> list:
     boundary = f"----WebKitFormBoundary{uuid.uuid4().hex}"
     body = bytearray()
@@ -55,6 +82,301 @@ def post_multipart(path: str, files: list[Path]) -> list:
         return json.loads(resp.read().decode("utf-8"))
 
 
+def get_bytes(path: str) -> bytes:
+    with request.urlopen(f"{BASE_URL}{path}") as resp:
+        return resp.read()
+
+
+def expect_status(status: int, call, *args) -> dict:
+    try:
+        call(*args)
+    except error.HTTPError as exc:
+        if exc.code != status:
+            raise RuntimeError(f"expected HTTP {status}, got {exc.code}") from exc
+        return json.loads(exc.read().decode("utf-8"))
+    raise RuntimeError(f"expected HTTP {status}, got a success response")
+
+
+def wait_until_finished(path: str) -> dict:
+    for _ in range(50):
+        current = get_json(path)
+        if current["status"] in {"done", "failed"}:
+            return current
+        time.sleep(0.3)
+    raise RuntimeError(f"{path} did not finish")
+
+
+def check_chunked_upload(dataset: dict, source: Path) -> None:
+    payload = source.read_bytes()
+    chunk_size = 256
+    session = post_json(
+        f"/api/datasets/{dataset['id']}/uploads",
+        {"chunk_size": chunk_size, "files": [{"file_name": source.name, "size_bytes": len(payload)}]},
+    )
+    total_chunks = session["files"][0]["total_chunks"]
+    if total_chunks < 4:
+        raise RuntimeError("chunked upload needs several chunks to be meaningful")
+
+    def send(chunk_index: int) -> dict:
+        chunk = payload[chunk_index * chunk_size : (chunk_index + 1) * chunk_size]
+        return put_bytes(f"/api/uploads/{session['id']}/files/0/chunks/{chunk_index}", chunk)
+
+    # Send all but one chunk, shuffled and in parallel, then check that finalize refuses.
+    order = list(range(total_chunks))
+    random.shuffle(order)
+    held_back, sent = order[0], order[1:]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(send, sent))
+
+    incomplete = expect_status(409, post_json, f"/api/uploads/{session['id']}/finalize", {})
+    if incomplete["detail"]["missing_chunks"] != {"0": [held_back]}:
+        raise RuntimeError(f"unexpected missing chunks: {incomplete['detail']}")
+    received = get_json(f"/api/uploads/{session['id']}")["files"][0]["received_chunks"]
+    if sorted(received) != sorted(sent):
+        raise RuntimeError("session does not report the received chunks")
+    log(f"chunked upload resumable: {len(sent)}/{total_chunks} chunks received")
+
+    send(held_back)
+    send(sent[0])  # a retried, already acknowledged chunk is a no-op
+    finalized = post_json(f"/api/uploads/{session['id']}/finalize", {})
+    if get_bytes(finalized[0]["static_url"]) != payload:
+        raise RuntimeError("finalized file does not match the uploaded bytes")
+    log(f"chunked upload finalized: {len(finalized)}")
+
+
+def check_comparison(project: dict, dataset: dict, model_id: str) -> None:
+    challenger = post_json(
+        "/api/models",
+        {
+            "name": f"smoke-timeseries-{uuid.uuid4().hex[:8]}",
+            "task_type": "timeseries",
+            "backend": "dummy",
+            "version": "v2",
+        },
+    )
+    comparison = post_json(
+        "/api/comparison-runs",
+        {
+            "project_id": project["id"],
+            "dataset_id": dataset["id"],
+            "model_ids": [model_id, challenger["id"]],
+            "params": {"threshold": 0.5},
+        },
+    )
+    comparison = wait_until_finished(f"/api/comparison-runs/{comparison['id']}")
+    log(f"comparison finalized: {comparison['status']}")
+    if comparison["status"] != "done":
+        raise RuntimeError(f"comparison failed: {comparison.get('error_message')}")
+
+    totals = {run["summary_json"]["total"] for run in comparison["runs"]}
+    diff = get_json(f"/api/comparison-runs/{comparison['id']}/diff?disagree_only=false&limit=500")
+    disagreements = get_json(f"/api/comparison-runs/{comparison['id']}/diff?limit=500")
+    log(f"comparison diff rows: {len(diff)} (disagree: {len(disagreements)})")
+    if len(totals) != 1 or len(diff) != totals.pop():
+        raise RuntimeError("comparison runs and diff disagree on the sample count")
+    if len(disagreements) != comparison["summary_json"]["disagree"]:
+        raise RuntimeError("disagreement count does not match the comparison summary")
+
+
+def check_preview_modes(project: dict, dataset: dict, model_id: str, population: int) -> None:
+    base = {"project_id": project["id"], "dataset_id": dataset["id"], "model_id": model_id, "params": {"threshold": 0.5}}
+    previews = {
+        "first_n": {"mode": "first_n", "sample_size": 10},
+        "random_sample": {"mode": "random_sample", "sample_size": 20, "seed": 7},
+        "time_budget": {"mode": "time_budget", "time_budget_seconds": 5},
+    }
+    finished: dict[str, dict] = {}
+    for name, plan in previews.items():
+        run = post_json("/api/inference-runs", {**base, **plan})
+        finished[name] = current = wait_until_finished(f"/api/inference-runs/{run['id']}")
+        estimate = (current["summary_json"] or {}).get("preview") or {}
+        log(f"{name} preview: {current['status']} sampled={estimate.get('sampled')} population={estimate.get('population')}")
+        if current["status"] != "done" or estimate.get("population") != population:
+            raise RuntimeError(f"{name} preview did not produce an estimate over the dataset")
+
+    if finished["first_n"]["summary_json"]["total"] != 10 or finished["random_sample"]["summary_json"]["total"] != 20:
+        raise RuntimeError("preview runs scored the wrong number of samples")
+    if "ok_rate_ci95" not in finished["random_sample"]["summary_json"]["preview"]:
+        raise RuntimeError("random_sample preview has no confidence interval")
+
+    preview_id = finished["random_sample"]["id"]
+    promoted = post_json(f"/api/inference-runs/{preview_id}/promote", {})
+    promoted = wait_until_finished(f"/api/inference-runs/{promoted['id']}")
+    log(f"promoted run: {promoted['status']} total={promoted['summary_json']['total']}")
+    if promoted["source_run_id"] != preview_id or promoted["summary_json"]["total"] != population:
+        raise RuntimeError("promoted run did not cover the whole dataset")
+
+    preview_keys = {row["sample_key"] for row in get_json(f"/api/inference-runs/{preview_id}/results?limit=500")}
+    promoted_keys = {row["sample_key"] for row in get_json(f"/api/inference-runs/{promoted['id']}/results?limit=500")}
+    if not preview_keys <= promoted_keys:
+        raise RuntimeError("promoted run is missing samples scored by its preview")
+
+
+def check_manifest_splits(project: dict, dataset: dict, model_id: str, full_run_id: str) -> None:
+    # Chunked uploads are hashed in the background after finalize.
+    for _ in range(50):
+        manifest = get_json(f"/api/datasets/{dataset['id']}/manifest?parts=3")
+        if all(entry["sha256"] for entry in manifest["files"]):
+            break
+        time.sleep(0.3)
+    else:
+        raise RuntimeError("manifest files were not indexed")
+    log(f"manifest: {len(manifest['files'])} files, splits={manifest['splits']['csv_rows']}")
+
+    full_keys = sorted(row["sample_key"] for row in get_json(f"/api/inference-runs/{full_run_id}/results?limit=500"))
+    if manifest["sample_counts"]["csv_rows"] != len(full_keys):
+        raise RuntimeError("manifest sample count does not match the full run")
+
+    split_keys: list[str] = []
+    for range_start, range_stop in manifest["splits"]["csv_rows"]:
+        run = post_json(
+            "/api/inference-runs",
+            {
+                "project_id": project["id"],
+                "dataset_id": dataset["id"],
+                "model_id": model_id,
+                "params": {"threshold": 0.5},
+                "range_start": range_start,
+                "range_stop": range_stop,
+            },
+        )
+        run = wait_until_finished(f"/api/inference-runs/{run['id']}")
+        if run["status"] != "done" or run["summary_json"]["total"] != range_stop - range_start:
+            raise RuntimeError(f"range run [{range_start}, {range_stop}) scored the wrong samples")
+        split_keys.extend(row["sample_key"] for row in get_json(f"/api/inference-runs/{run['id']}/results?limit=500"))
+    log(f"range runs scored: {len(split_keys)}")
+    if sorted(split_keys) != full_keys:
+        raise RuntimeError("range runs do not partition the dataset")
+
+
+def check_result_filters(run_id: str) -> None:
+    results_path = f"/api/inference-runs/{run_id}/results?limit=500"
+    rows = get_json(results_path)
+
+    def expect_keys(query: str, predicate) -> list[dict]:
+        filtered = get_json(f"{results_path}&{query}")
+        expected = sorted(row["sample_key"] for row in rows if predicate(row))
+        if sorted(row["sample_key"] for row in filtered) != expected:
+            raise RuntimeError(f"results filter {query!r} returned the wrong rows")
+        return filtered
+
+    expect_keys("verdict=ok", lambda row: row["verdict"] == "ok")
+    expect_keys("score_min=0.2&score_max=0.7", lambda row: 0.2 <= row["score"] <= 0.7)
+    expect_status(400, get_json, f"{results_path}&score_min=0.9&score_max=0.1")
+    expect_keys("sample_key_prefix=chunked.csv:row:1", lambda row: row["sample_key"].startswith("chunked.csv:row:1"))
+    # Needles of three or more characters go through the FTS index, shorter ones through LIKE.
+    expect_keys("q=row:19", lambda row: "row:19" in row["sample_key"])
+    expect_keys("q=7", lambda row: "7" in row["sample_key"])
+    expect_keys("source_file=chunked.csv", lambda row: row["source_file"] == "chunked.csv")
+
+    validated_key = rows[0]["sample_key"]
+    post_json("/api/validations", {"run_id": run_id, "sample_key": validated_key, "human_verdict": "ok"})
+    expect_keys("validated=true", lambda row: row["sample_key"] == validated_key)
+    expect_keys("validated=false", lambda row: row["sample_key"] != validated_key)
+
+    by_score = get_json(f"{results_path}&sort_by=score&order=desc")
+    scores = [row["score"] for row in by_score]
+    if len(by_score) != len(rows) or scores != sorted(scores, reverse=True):
+        raise RuntimeError("results are not sorted by descending score")
+    log(f"result filters checked over {len(rows)} rows")
+
+
+def start_mock_model_server(fail_rate: float) -> tuple[subprocess.Popen, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            str(Path(__file__).with_name("mock_model_server.py")),
+            "--port",
+            str(port),
+            "--latency-ms",
+            "5",
+            "--fail-rate",
+            str(fail_rate),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(50):
+        try:
+            with request.urlopen(f"{url}/v2/health/ready"):
+                return server, url
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("mock model server did not start")
+
+
+def check_remote_backend(project: dict, dataset: dict) -> None:
+    name = f"smoke-remote-{uuid.uuid4().hex[:8]}"
+    expect_status(
+        400,
+        post_json,
+        "/api/models",
+        {"name": name, "task_type": "timeseries", "backend": "remote", "version": "v1"},
+    )
+
+    server, url = start_mock_model_server(fail_rate=0.1)
+    try:
+        model = post_json(
+            "/api/models",
+            {
+                "name": name,
+                "task_type": "timeseries",
+                "backend": "remote",
+                "version": "v1",
+                "config": {"url": url, "model_name": "mock", "max_retries": 5, "backoff_seconds": 0.05},
+            },
+        )
+        run = post_json(
+            "/api/inference-runs",
+            {"project_id": project["id"], "dataset_id": dataset["id"], "model_id": model["id"], "params": {"threshold": 0.5}},
+        )
+        run = wait_until_finished(f"/api/inference-runs/{run['id']}")
+        with request.urlopen(f"{url}/stats") as resp:
+            stats = json.loads(resp.read().decode("utf-8"))
+    finally:
+        server.terminate()
+        server.wait(timeout=5)
+
+    log(
+        f"remote run: {run['status']} total={(run['summary_json'] or {}).get('total')} "
+        f"max_batch={stats['max_batch']} injected_failures={stats['injected_failures']}"
+    )
+    if run["status"] != "done":
+        raise RuntimeError(f"remote run failed: {run.get('error_message')}")
+    if stats["max_batch"] <= 1:
+        raise RuntimeError("remote backend did not batch requests")
+
+
+def check_archive_rehydrate(project: dict, run_id: str) -> None:
+    results_path = f"/api/inference-runs/{run_id}/results?limit=500&sort_by=sample_key"
+    before = get_json(results_path)
+
+    # Archive every finished run of the smoke project right away.
+    put_json(f"/api/projects/{project['id']}/retention-policy", {"archive_after_days": 0, "keep_latest_runs": 0})
+    post_json("/api/storage/compact", {})
+    for _ in range(50):
+        if get_json(f"/api/inference-runs/{run_id}")["archived_at"] is not None:
+            break
+        time.sleep(0.3)
+    else:
+        raise RuntimeError("run was not archived")
+    log("run archived")
+
+    after = get_json(results_path)
+    log(f"archived results rehydrated: {len(after)}")
+    if after != before:
+        raise RuntimeError("rehydrated results differ from the originals")
+    if get_json(f"/api/inference-runs/{run_id}")["archived_at"] is not None:
+        raise RuntimeError("run is still marked as archived after rehydration")
+
+    # Later steps create runs in this project; keep them hot.
+    put_json(f"/api/projects/{project['id']}/retention-policy", {"archive_after_days": 30, "keep_latest_runs": 5})
+
+
 def main() -> int:
     try:
         project = post_json("/api/projects", {"name": "smoke-project"})
@@ -74,6 +396,12 @@ def main() -> int:
         uploaded = post_multipart(f"/api/datasets/{dataset['id']}/files", [sample_csv])
         log(f"files uploaded: {len(uploaded)}")
 
+        chunked_csv = tmp_dir / "chunked.csv"
+        chunked_csv.write_text("".join(f"{i},{i * 2}\n" for i in range(200)), encoding="utf-8")
+        check_chunked_upload(dataset, chunked_csv)
+        duplicate = {"file_name": "dup.csv", "size_bytes": 1}
+        expect_status(400, post_json, f"/api/datasets/{dataset['id']}/uploads", {"files": [duplicate, duplicate]})
+
         models = get_json("/api/models?modality=timeseries")
         if not models:
             raise RuntimeError("no models returned for timeseries")
@@ -89,13 +417,7 @@ def main() -> int:
         )
         log(f"run created: {run['id']} status={run['status']}")
 
-        import time
-
-        for _ in range(20):
-            current = get_json(f"/api/inference-runs/{run['id']}")
-            if current["status"] in {"done", "failed"}:
-                break
-            time.sleep(0.3)
+        current = wait_until_finished(f"/api/inference-runs/{run['id']}")
         log(f"run finalized: {current['status']}")
 
         results = get_json(f"/api/inference-runs/{run['id']}/results?limit=20&offset=0")
@@ -103,6 +425,13 @@ def main() -> int:
         if not results:
             raise RuntimeError("no results produced")
 
+        check_result_filters(run["id"])
+        check_comparison(project, dataset, models[0]["id"])
+        check_preview_modes(project, dataset, models[0]["id"], population=current["summary_json"]["total"])
+        check_manifest_splits(project, dataset, models[0]["id"], run["id"])
+        check_remote_backend(project, dataset)
+        check_archive_rehydrate(project, run["id"])
+
         log("smoke test succeeded")
         return 0
     except Exception as exc:  # noqa: BLE001